@@ -1,147 +1,911 @@
+import glob
+import hashlib
+import hmac
+import importlib.util
+import json
+import multiprocessing
 import os
-from flask import Flask, request, jsonify, send_from_directory
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import (Flask, Request, request, jsonify, send_from_directory, Response, stream_with_context, g,
+                   has_request_context)
 from flask_cors import CORS
-from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 
 # Import backend modules
-from backend.parsers.resume_parser import ResumeParser
+from backend.parsers.resume_parser import ResumeParser, parse_resume
 from backend.utils.keyword_extractor import KeywordExtractor
 from backend.models.job_role_analyzer import JobRoleAnalyzer
 from backend.models.suggestion_generator import SuggestionGenerator
 from backend.models.ats_analyzer import ATSAnalyzer
 from backend.models.industry_analyzer import IndustryAnalyzer
-
-app = Flask(__name__, static_folder='frontend')
-CORS(app)
+from backend.models.job_requirements import JOB_REQUIREMENTS
+from backend.utils.analyzer_registry import AnalyzerRegistry
+from backend.utils.skill_matcher import SkillMatcher
+from backend.utils.result_cache import SqliteCache, TieredCache
+from backend.utils.uploads import UploadRejected, UploadSpool, file_extension, read_batch_uploads, receive_upload
+from backend.utils.job_queue import JobQueue, QueueFullError
+from backend.utils.text_profile import TextProfile
+from backend.utils.analysis_context import AnalysisContext
+from backend.utils.stage_graph import StageGraph
+from backend.utils.candidate_index import CandidateIndex
+from backend.utils.admission import AdmissionController, AdmissionRejected, WorkClass
+from backend.utils.profiler import RequestProfiler, PROFILE_MODES, is_profiling
+from backend.utils.responses import ResponseEncoder, parse_fields, project
+from backend.utils.static_assets import StaticBundle
+from backend.utils.metrics import (MetricsRegistry, BYTE_BUCKETS, CHARACTER_BUCKETS, PAGE_BUCKETS,
+                                   server_timing_header)
 
 # Configuration
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'jpg', 'jpeg', 'png'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-
-# Create uploads folder if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-# Sample job requirements
-JOB_REQUIREMENTS = {
-    'software_engineer': ['python', 'javascript', 'sql', 'git', 'aws'],
-    'data_scientist': ['python', 'machine learning', 'sql', 'statistics', 'tensorflow'],
-    'web_developer': ['html', 'css', 'javascript', 'react', 'node.js'],
-    'devops_engineer': ['docker', 'kubernetes', 'jenkins', 'aws', 'terraform'],
-    'mobile_developer': ['android', 'ios', 'react native', 'flutter', 'mobile testing'],
-    'cloud_architect': ['aws', 'azure', 'cloud architecture', 'microservices', 'security'],
-    'security_engineer': ['cybersecurity', 'penetration testing', 'security audit', 'encryption'],
-    'data_engineer': ['sql', 'etl', 'hadoop', 'spark', 'data warehouse'],
-    'ml_engineer': ['machine learning', 'deep learning', 'python', 'tensorflow', 'mlops'],
-    'ui_ux_designer': ['figma', 'user research', 'wireframing', 'prototyping', 'adobe xd'],
-    'qa_engineer': ['selenium', 'test automation', 'jira', 'test planning', 'api testing'],
-    'blockchain_developer': ['solidity', 'smart contracts', 'web3', 'ethereum', 'defi'],
-    'game_developer': ['unity', 'unreal engine', 'c++', 'game design', '3d modeling'],
-    'embedded_systems': ['c', 'embedded c', 'rtos', 'microcontrollers', 'firmware'],
-    'network_engineer': ['cisco', 'networking', 'tcp/ip', 'security', 'vpn']
+
+# Uploads are parsed from memory; only files larger than this are spooled to
+# an anonymous temporary file
+UPLOAD_SPOOL_THRESHOLD = int(os.environ.get('UPLOAD_SPOOL_THRESHOLD', 5 * 1024 * 1024))
+
+# Requests with a larger body are refused before it is read. Each uploaded
+# file is also capped by type while it streams in; zip archives for batch
+# uploads are only bound by the request limit.
+MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 100 * 1024 * 1024))
+IMAGE_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_IMAGE_BYTES', 10 * 1024 * 1024))
+UPLOAD_MAX_BYTES = {
+    'pdf': int(os.environ.get('UPLOAD_MAX_PDF_BYTES', 10 * 1024 * 1024)),
+    'docx': int(os.environ.get('UPLOAD_MAX_DOCX_BYTES', 5 * 1024 * 1024)),
+    'jpg': IMAGE_MAX_BYTES,
+    'jpeg': IMAGE_MAX_BYTES,
+    'png': IMAGE_MAX_BYTES,
+    'zip': None
 }
 
+def upload_limit(filename):
+    # Files of any other type are refused, so none of them is kept
+    return UPLOAD_MAX_BYTES.get(file_extension(filename), 0)
+
+class UploadRequest(Request):
+    # Multipart files are size-checked, format-sniffed and hashed as the body
+    # is received, so a bad upload is dropped before it reaches a parser
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return UploadSpool(filename, upload_limit(filename), UPLOAD_SPOOL_THRESHOLD)
+
+app = Flask(__name__, static_folder='frontend')
+app.request_class = UploadRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+CORS(app)
+
+# Prometheus metrics at /metrics and a Server-Timing header on every response.
+# Values are per worker process. METRICS_ENABLED=0 turns both off.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+metrics = MetricsRegistry(enabled=METRICS_ENABLED)
+REQUEST_SECONDS = metrics.histogram(
+    'resume_http_request_duration_seconds', 'HTTP request latency', ('endpoint', 'method', 'status'))
+REQUESTS_IN_FLIGHT = metrics.gauge('resume_http_requests_in_flight', 'HTTP requests being served')
+STAGE_SECONDS = metrics.histogram(
+    'resume_stage_duration_seconds', 'Latency of each parsing and analysis stage', ('stage',))
+UPLOAD_BYTES = metrics.histogram(
+    'resume_upload_bytes', 'Size of parsed uploads', ('file_type',), buckets=BYTE_BUCKETS)
+TEXT_CHARACTERS = metrics.histogram(
+    'resume_text_length_characters', 'Length of extracted text', ('file_type',), buckets=CHARACTER_BUCKETS)
+PDF_PAGES = metrics.histogram('resume_pdf_pages', 'Pages extracted per PDF', buckets=PAGE_BUCKETS)
+FILES_TOTAL = metrics.counter('resume_files_total', 'Resumes analyzed by file type', ('file_type',))
+ROLES_TOTAL = metrics.counter('resume_role_requests_total', 'Resumes analyzed by job role', ('role',))
+ERRORS_TOTAL = metrics.counter('resume_errors_total', 'Failed analyses by error class', ('error',))
+UPLOADS_REJECTED = metrics.counter('resume_uploads_rejected_total', 'Uploads refused before parsing', ('status',))
+ADMISSION_REJECTIONS = metrics.counter(
+    'resume_admission_rejections_total', 'Parses refused by admission control', ('work_class', 'reason'))
+ADMISSION_LIMIT = metrics.gauge('resume_admission_limit', 'Current concurrency limit', ('work_class',))
+ADMISSION_QUEUED = metrics.gauge('resume_admission_queued', 'Parses waiting for a slot', ('work_class',))
+
+# Parsing is admitted per class of work: OCR and PDF layout analysis get their
+# own concurrency limits, separate from cheap DOCX parsing. Limits adapt to
+# observed latency, waits are bounded, and a request that cannot start before
+# its deadline is refused with 503 and Retry-After instead of timing out.
+REQUEST_DEADLINE = int(os.environ.get('REQUEST_DEADLINE', 30))
+ADMISSION_QUEUE_SIZE = int(os.environ.get('ADMISSION_QUEUE_SIZE', 16))
+admission = AdmissionController([
+    WorkClass('ocr', int(os.environ.get('ADMISSION_OCR_LIMIT', max(1, (os.cpu_count() or 1) // 2))),
+              max_queue=ADMISSION_QUEUE_SIZE, target_latency=10.0),
+    WorkClass('pdf', int(os.environ.get('ADMISSION_PDF_LIMIT', os.cpu_count() or 1)),
+              max_queue=ADMISSION_QUEUE_SIZE, target_latency=2.0),
+    WorkClass('light', int(os.environ.get('ADMISSION_LIGHT_LIMIT', 4 * (os.cpu_count() or 1))),
+              max_queue=ADMISSION_QUEUE_SIZE, target_latency=0.5)
+], enabled=os.environ.get('ADMISSION_ENABLED', '1') != '0')
+WORK_CLASSES = {'jpg': 'ocr', 'jpeg': 'ocr', 'png': 'ocr', 'pdf': 'pdf', 'docx': 'light'}
+
+def record_admission():
+    for name, stats in admission.stats().items():
+        ADMISSION_LIMIT.set(stats['limit'], work_class=name)
+        ADMISSION_QUEUED.set(stats['queued'], work_class=name)
+
+# On-demand profiling of /analyze: requests presenting PROFILE_TOKEN in the
+# X-Profile-Token header are profiled, and so is one in every
+# PROFILE_SAMPLE_RATE requests when that is set. The token is never read from
+# the URL, where it would end up in access logs and Referer headers.
+profiler = RequestProfiler(
+    token=os.environ.get('PROFILE_TOKEN') or None,
+    sample_rate=int(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+    mode=os.environ.get('PROFILE_MODE', 'cprofile'),
+    buffer_size=int(os.environ.get('PROFILE_BUFFER_SIZE', 20)),
+    sample_interval=int(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 5)) / 1000
+)
+
+# Analysis results are serialized with orjson when it is installed and
+# compressed (zstd, brotli or gzip, as the client accepts) above a size
+# threshold. COMPRESS_MIN_BYTES=0 compresses everything; an empty
+# COMPRESS_ENCODINGS turns compression off.
+responses = ResponseEncoder(
+    json_backend=os.environ.get('JSON_BACKEND', 'auto'),
+    min_size=int(os.environ.get('COMPRESS_MIN_BYTES', 1024)),
+    encodings=[encoding.strip() for encoding in os.environ.get('COMPRESS_ENCODINGS', 'zstd,br,gzip').split(',')
+               if encoding.strip()]
+)
+
+def profile_token():
+    return request.headers.get('X-Profile-Token')
+
+def index_authorized():
+    supplied = request.headers.get('X-Index-Token')
+    return bool(CANDIDATE_INDEX_TOKEN) and bool(supplied) and hmac.compare_digest(supplied, CANDIDATE_INDEX_TOKEN)
+
+def file_type(filename):
+    return filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else 'unknown'
+
+def record_timings(timings):
+    # Stage latencies (ms) go to the histogram and to this request's
+    # Server-Timing header
+    if not METRICS_ENABLED:
+        return
+    for stage, ms in timings.items():
+        STAGE_SECONDS.observe(ms / 1000, stage=stage)
+    if has_request_context():
+        g.server_timing.update(timings)
+
+def record_parse(parsed, filename):
+    # Takes the parser's statistics out of a parse result before it is cached
+    stats = parsed.pop('parse_stats', None)
+    if stats is None:
+        return
+    kind = file_type(filename)
+    UPLOAD_BYTES.observe(stats['bytes'], file_type=kind)
+    TEXT_CHARACTERS.observe(len(parsed['text']), file_type=kind)
+    if stats['pages']:
+        PDF_PAGES.observe(stats['pages'])
+    record_timings(stats['timings'])
+
+def record_error(error):
+    ERRORS_TOTAL.inc(error=type(error).__name__)
+
+# Analyzers are stateless between requests, so each worker shares one instance
+# of each. Loading them at import time lets gunicorn's preload_app build them
+# once in the master process and hand them to forked workers copy-on-write.
+analyzers = AnalyzerRegistry()
+analyzers.register('keyword_extractor', KeywordExtractor)
+analyzers.register('job_role_analyzer', JobRoleAnalyzer)
+analyzers.register('suggestion_generator', SuggestionGenerator)
+analyzers.register('ats_analyzer', ATSAnalyzer)
+analyzers.register('industry_analyzer', IndustryAnalyzer)
+# One matcher over every skill, industry term and role keyword: a single scan
+# of each resume serves keyword extraction, industry detection and the
+# candidate index
+analyzers.register('term_matcher', lambda: SkillMatcher(
+    analyzers.get('keyword_extractor').skill_matcher.terms |
+    analyzers.get('industry_analyzer').term_matcher.terms |
+    set(analyzers.get('job_role_analyzer').vocabulary)
+))
+def build_jd_matcher():
+    # scipy is only needed by /match, so it is imported when that is first used
+    from backend.models.jd_matcher import JDMatcher
+    return JDMatcher(analyzers.get('term_matcher').terms,
+                     cache_size=int(os.environ.get('JD_CACHE_SIZE', 64)))
+
+# Free-text job descriptions are matched over the same taxonomy plus their
+# own word n-grams; fitted descriptions are cached by hash
+analyzers.register('jd_matcher', build_jd_matcher, preload=False)
+
+if os.environ.get('PRELOAD_ANALYZERS', '1') != '0':
+    analyzers.load_all()
+    analyzers.report()
+
+# Repeat uploads of the same file are served from a cache keyed by the SHA-256
+# of its bytes: extracted text and sections per file, full results per
+# (file, role). RESUME_CACHE_PATH adds a sqlite tier that survives restarts.
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+OCR_SETTINGS = ('OCR_TARGET_DPI', 'OCR_BINARIZE', 'OCR_TILE', 'OCR_BAND_HEIGHT')
+
+def cache_fingerprint():
+    # Every key also carries a hash of what shaped the entry, so a change of
+    # parser or OCR settings, of the PDF library 'auto' resolves to, or of
+    # the data files and analyzer code (skill taxonomy, role requirements)
+    # misses entries cached before it, including those on disk
+    parser = ResumeParser()
+    settings = {
+        'max_pages': parser.max_pages,
+        'max_chars': parser.max_chars,
+        'pdf_backend': parser.pdf_backend,
+        'docx_backend': parser.docx_backend,
+        'pymupdf': any(importlib.util.find_spec(name) is not None for name in ('pymupdf', 'fitz')),
+        'ocr': {name: os.environ.get(name) for name in OCR_SETTINGS}
+    }
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode())
+    for path in sorted(glob.glob(os.path.join(BACKEND_DIR, 'data', '*.json')) +
+                       glob.glob(os.path.join(BACKEND_DIR, '**', '*.py'), recursive=True)):
+        digest.update(os.path.relpath(path, BACKEND_DIR).encode())
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+CACHE_FINGERPRINT = cache_fingerprint()
+
+def text_cache_key(file_hash):
+    return f"{file_hash}:{CACHE_FINGERPRINT}"
+
+def result_cache_key(file_hash, role):
+    return f"{file_hash}:{CACHE_FINGERPRINT}:{role}"
+
+CACHE_TTL = int(os.environ.get('RESUME_CACHE_TTL', 3600))
+RESUME_CACHE_PATH = os.environ.get('RESUME_CACHE_PATH')
+text_cache = TieredCache('parsed_text', maxsize=int(os.environ.get('TEXT_CACHE_SIZE', 256)),
+                         ttl=CACHE_TTL, disk_path=RESUME_CACHE_PATH)
+result_cache = TieredCache('analysis_results', maxsize=int(os.environ.get('RESULT_CACHE_SIZE', 1024)),
+                           ttl=CACHE_TTL, disk_path=RESUME_CACHE_PATH)
+
+# With CANDIDATE_INDEX_PATH set, every analyzed resume is recorded (term
+# counts, sections and years of experience, not its text) in a sqlite index.
+# /search and DELETE /candidates/<id> only answer requests presenting
+# CANDIDATE_INDEX_TOKEN in the X-Index-Token header.
+CANDIDATE_INDEX_PATH = os.environ.get('CANDIDATE_INDEX_PATH') or None
+CANDIDATE_INDEX_TOKEN = os.environ.get('CANDIDATE_INDEX_TOKEN') or None
+candidate_index = CandidateIndex(
+    CANDIDATE_INDEX_PATH,
+    role_terms={role: details['keywords']
+                for role, details in analyzers.get('job_role_analyzer').job_roles.items()}
+) if CANDIDATE_INDEX_PATH else None
+SEARCH_MAX_K = int(os.environ.get('SEARCH_MAX_K', 500))
+
+# Batch uploads: pdfminer and tesseract are CPU bound, so text extraction runs
+# in a pool of worker processes created on first use
+BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', 500))
+BATCH_MAX_FILE_BYTES = int(os.environ.get('BATCH_MAX_FILE_BYTES', 10 * 1024 * 1024))
+# Combined size of a batch's resumes after unzipping
+BATCH_MAX_TOTAL_BYTES = int(os.environ.get('BATCH_MAX_TOTAL_BYTES', 200 * 1024 * 1024))
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', os.cpu_count() or 1))
+# Files of one batch in the pool at a time; the rest wait their turn so the
+# pool's queue never holds a copy of every file
+PARSE_WINDOW = int(os.environ.get('PARSE_WINDOW', PARSE_WORKERS * 2))
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def parse_pool_context():
+    # The pool is created lazily in a process already running analysis, job
+    # and OCR threads; a forked child could inherit a lock one of them holds.
+    # A fork server (itself started clean) or spawn avoids that, and the
+    # fork server preloads the parser so new workers start quickly.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['backend.parsers.resume_parser'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+def get_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=parse_pool_context())
+        return _parse_pool
+
+def reset_parse_pool():
+    # A worker that dies (e.g. killed for using too much memory) breaks the
+    # whole pool; drop it so the next batch starts a fresh one
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False)
+            _parse_pool = None
+
+MATCH_MAX_JOB_DESCRIPTIONS = int(os.environ.get('MATCH_MAX_JOB_DESCRIPTIONS', 50))
+
+# Submit/poll jobs for slow uploads such as scanned images. A job runs in the
+# worker process that accepted it; its state is written to the JOB_STORE_PATH
+# sqlite file so a poll reaching any worker finds it. Set JOB_STORE_PATH to an
+# empty string to keep jobs in process memory (only with a single worker).
+JOB_TIMEOUT = int(os.environ.get('JOB_TIMEOUT', 120))
+JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 600))
+JOB_STORE_PATH = os.environ.get('JOB_STORE_PATH', os.path.join(app.instance_path, 'jobs.sqlite3'))
+job_queue = JobQueue(
+    max_workers=int(os.environ.get('JOB_WORKERS', 2)),
+    max_pending=int(os.environ.get('JOB_MAX_PENDING', 20)),
+    job_timeout=JOB_TIMEOUT,
+    result_ttl=JOB_RESULT_TTL,
+    store=SqliteCache(JOB_STORE_PATH, 'jobs', ttl=JOB_TIMEOUT + JOB_RESULT_TTL) if JOB_STORE_PATH else None
+)
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# The analysis is a declared stage graph: each stage names what it needs, so
+# independent stages run side by side and only requested outputs are computed
+ANALYSIS_THREADS = int(os.environ.get('ANALYSIS_THREADS', 4))
+analysis_graph = StageGraph(
+    executor=ThreadPoolExecutor(max_workers=ANALYSIS_THREADS, thread_name_prefix='analysis')
+    if ANALYSIS_THREADS > 1 else None
+)
+
+@analysis_graph.stage('keywords')
+def keywords_stage(context):
+    return analyzers.get('keyword_extractor').extract_keywords(context.text, context=context)
+
+@analysis_graph.stage('role_match', deps=('keywords',))
+def role_match_stage(context, keywords):
+    return analyzers.get('job_role_analyzer').analyze_specific_role(
+        context.text, keywords, context.role, context=context)
+
+@analysis_graph.stage('suitable_roles', deps=('keywords',))
+def suitable_roles_stage(context, keywords):
+    return analyzers.get('job_role_analyzer').analyze_job_roles(context.text, keywords, context=context)
+
+@analysis_graph.stage('suggestions', deps=('keywords',))
+def suggestions_stage(context, keywords):
+    return analyzers.get('suggestion_generator').generate_suggestions(
+        role=context.role,
+        found_skills=set(keywords.keys()),
+        sections=context.sections
+    )
+
+@analysis_graph.stage('ats', deps=('keywords',))
+def ats_stage(context, keywords):
+    # Create job requirements structure for ATS
+    role_requirements = {
+        'keywords': JOB_REQUIREMENTS[context.role],
+        'required_years': 2,  # Default requirement
+        'weight': 1.0
+    }
+    return analyzers.get('ats_analyzer').calculate_ats_score(
+        text=context.text,
+        role_requirements=role_requirements,
+        sections=context.sections,
+        skills_found=keywords,
+        context=context
+    )
+
+@analysis_graph.stage('industry_analysis', deps=('keywords',))
+def industry_stage(context, keywords):
+    return analyzers.get('industry_analyzer').analyze_industry_fit(context.text, keywords, context=context)
+
+# Response field -> (stage that produces it, how to read it from the result)
+RESPONSE_FIELDS = {
+    'score': ('role_match', lambda match: round(match['confidence'], 2)),
+    'ats_score': ('ats', lambda ats: ats['overall_score']),
+    'ats_details': ('ats', lambda ats: ats['detailed_scores']),
+    'ats_recommendations': ('ats', lambda ats: ats['recommendations']),
+    'sections_found': (None, None),
+    'keywords': ('keywords', lambda keywords: keywords),
+    'suitable_roles': ('suitable_roles', lambda roles: roles),
+    'suggestions': ('suggestions', lambda suggestions: suggestions),
+    'industry_analysis': ('industry_analysis', lambda industry: industry)
+}
+
+def index_candidate(context, file_hash, filename):
+    # Reuses the term counts of the analysis; indexing failures never fail it
+    try:
+        candidate_index.add(
+            file_hash, filename,
+            context.term_counts(analyzers.get('term_matcher')),
+            context.sections,
+            context.profile.years_of_experience()
+        )
+    except Exception as e:
+        print(f"Error indexing candidate {file_hash}: {str(e)}")
+
+def run_analysis(text, sections, selected_role, profile=None, fields=None, index_as=None):
+    # index_as is an optional (file hash, filename) to record in the candidate index
+    if selected_role not in JOB_REQUIREMENTS:
+        raise KeyError(selected_role)
+
+    fields = list(RESPONSE_FIELDS) if fields is None else fields
+    context = AnalysisContext(text, sections=sections, role=selected_role, profile=profile,
+                              matcher=analyzers.get('term_matcher'))
+    targets = {RESPONSE_FIELDS[field][0] for field in fields} - {None}
+    # A profiled request keeps its stages on its own thread so the profiler sees them
+    results = analysis_graph.run(targets, context, serial=is_profiling())
+    record_timings(context.timings)
+    if index_as is not None and candidate_index is not None:
+        index_candidate(context, *index_as)
+
+    response = {}
+    for field in fields:
+        stage, read = RESPONSE_FIELDS[field]
+        response[field] = sections if stage is None else read(results[stage])
+    return response
+
+def load_profile(parsed):
+    # Parsed entries carry the parser's text profile; entries cached before
+    # it existed get None and the ATS analyzer profiles the text itself
+    profile = parsed.get('profile')
+    return TextProfile.from_dict(profile) if profile else None
+
+def analyze_cached(file_hash, selected_role, parse, filename=None, refresh=False, fields=None):
+    # Result for an upload, parsing it with parse() only when neither the
+    # result nor the extracted text is cached yet. refresh recomputes both
+    # and updates the caches. With fields, only those are returned; they
+    # come from the cached full result when there is one and are otherwise
+    # computed on their own and not cached.
+    FILES_TOTAL.inc(file_type=file_type(filename))
+    ROLES_TOTAL.inc(role=selected_role)
+    result_key = result_cache_key(file_hash, selected_role)
+    result = None if refresh else result_cache.get(result_key)
+    if result is None:
+        parsed = None if refresh else text_cache.get(text_cache_key(file_hash))
+        if parsed is None:
+            parsed = parse()
+            record_parse(parsed, filename)
+            text_cache.set(text_cache_key(file_hash), parsed)
+        result = run_analysis(parsed['text'], parsed['sections'], selected_role,
+                              load_profile(parsed), fields=fields, index_as=(file_hash, filename))
+        if fields is not None:
+            return result
+        result_cache.set(result_key, result)
+    return project(result, fields)
+
+def run_analysis_job(data, file_hash, filename, selected_role, deadline):
+    def parse():
+        # Parse in the process pool so the deadline can be enforced while
+        # tesseract or pdfminer are still busy. At the deadline the parse is
+        # cancelled if still queued; one already handed to a worker skips
+        # parsing if it has not started by then, but once started it runs to
+        # completion and its result is discarded.
+        expires_at = time.time() + (deadline - time.monotonic())
+        future = get_parse_pool().submit(parse_resume, data, filename, expires_at)
+        try:
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            reset_parse_pool()
+            raise Exception('Parser process crashed')
+
+    return analyze_cached(file_hash, selected_role, parse, filename)
+
+def iter_parsed(indexed_items):
+    # Yields (index, item, parsed, error) for (index, BatchItem) pairs as soon
+    # as each is ready: cached text straight away, everything else once the
+    # process pool has parsed it. At most PARSE_WINDOW files are submitted at
+    # a time; the next one goes in as soon as one finishes.
+    pending = {}
+
+    def collect(future):
+        index, item = pending.pop(future)
+        try:
+            parsed = future.result()
+            record_parse(parsed, item.filename)
+            text_cache.set(text_cache_key(item.sha256), parsed)
+            return index, item, parsed, None
+        except BrokenProcessPool as e:
+            record_error(e)
+            reset_parse_pool()
+            return index, item, None, 'Parser process crashed'
+        except Exception as e:
+            record_error(e)
+            return index, item, None, f'Error analyzing resume: {str(e)}'
+
+    for index, item in indexed_items:
+        parsed = text_cache.get(text_cache_key(item.sha256))
+        if parsed is not None:
+            yield index, item, parsed, None
+            continue
+
+        while len(pending) >= PARSE_WINDOW:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield collect(future)
+
+        future = get_parse_pool().submit(parse_resume, item.data, item.filename)
+        pending[future] = (index, item)
+        # The bytes now live in the worker's queue; release our copy
+        item.data = None
+
+    for future in as_completed(list(pending)):
+        yield collect(future)
+
+def iter_batch_results(items, selected_role, fields=None):
+    # Yields one result per item as soon as it is ready. Cached results are
+    # answered straight away, everything else is parsed first. Results
+    # limited to fields are not cached, as in analyze_cached.
+    def ok(index, item, result):
+        return {'index': index, 'filename': item.filename, 'status': 'ok', 'result': result}
+
+    def failed(index, item, error):
+        return {'index': index, 'filename': item.filename, 'status': 'error', 'error': error}
+
+    to_parse = []
+    for index, item in enumerate(items):
+        if item.error:
+            yield failed(index, item, item.error)
+            continue
+
+        FILES_TOTAL.inc(file_type=file_type(item.filename))
+        ROLES_TOTAL.inc(role=selected_role)
+        cached_result = result_cache.get(result_cache_key(item.sha256, selected_role))
+        if cached_result is not None:
+            yield ok(index, item, project(cached_result, fields))
+            continue
+
+        to_parse.append((index, item))
+
+    for index, item, parsed, error in iter_parsed(to_parse):
+        if error:
+            yield failed(index, item, error)
+            continue
+        try:
+            result = run_analysis(parsed['text'], parsed['sections'], selected_role,
+                                  load_profile(parsed), fields=fields, index_as=(item.sha256, item.filename))
+            if fields is None:
+                result_cache.set(result_cache_key(item.sha256, selected_role), result)
+            yield ok(index, item, result)
+        except Exception as e:
+            record_error(e)
+            yield failed(index, item, f'Error analyzing resume: {str(e)}')
+
+if METRICS_ENABLED:
+    @app.before_request
+    def start_request_metrics():
+        g.request_start = time.perf_counter()
+        g.server_timing = {}
+        REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def finish_request_metrics(response):
+        elapsed = time.perf_counter() - g.request_start
+        # The route pattern rather than the path keeps label cardinality bounded
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method,
+                                status=str(response.status_code))
+        g.server_timing['total'] = elapsed * 1000
+        response.headers['Server-Timing'] = server_timing_header(g.server_timing)
+        return response
+
+    @app.teardown_request
+    def release_request_metrics(error=None):
+        if 'request_start' in g:
+            REQUESTS_IN_FLIGHT.dec()
+
+# Registered after the metrics hooks so it runs before them and its time is
+# part of the request latency
+@app.after_request
+def compress_response(response):
+    start = time.perf_counter()
+    response = responses.compress_response(response, request.headers.get('Accept-Encoding'))
+    if 'Content-Encoding' in response.headers:
+        record_timings({'compress': (time.perf_counter() - start) * 1000})
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    if not METRICS_ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/profiles')
+def list_profiles():
+    if not profiler.authorized(profile_token()):
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify({'profiles': profiler.list()})
+
+@app.route('/admin/profiles/<profile_id>')
+def download_profile(profile_id):
+    if not profiler.authorized(profile_token()):
+        return jsonify({'error': 'Not found'}), 404
+    profile = profiler.get(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Profile not found'}), 404
+
+    output = request.args.get('format', profile.formats()[0])
+    if output not in profile.formats():
+        return jsonify({'error': f'Available formats: {", ".join(profile.formats())}'}), 400
+    if output == 'pstats':
+        # Load with pstats.Stats(path) or open in snakeviz
+        response = Response(profile.pstats_data, mimetype='application/octet-stream')
+        response.headers['Content-Disposition'] = f'attachment; filename=profile-{profile.id}.pstats'
+        return response
+    if output == 'text':
+        return Response(profile.text_report(), mimetype='text/plain')
+    # flamegraph.pl / speedscope compatible collapsed stacks
+    return Response(profile.collapsed_stacks, mimetype='text/plain')
+
+# The frontend is read, fingerprinted and precompressed once at startup.
+# STATIC_BUNDLE=0 serves it straight from disk instead, e.g. while editing it.
+static_bundle = StaticBundle(app.static_folder) if os.environ.get('STATIC_BUNDLE', '1') != '0' else None
+
 # Serve frontend files
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_frontend(path):
+    if static_bundle is not None:
+        response = static_bundle.response(path, request.headers)
+        if response is not None:
+            return response
     if path and os.path.exists(os.path.join(app.static_folder, path)):
         return send_from_directory(app.static_folder, path)
     else:
         return send_from_directory(app.static_folder, 'index.html')
 
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify({
+        'parsed_text': text_cache.stats(),
+        'analysis_results': result_cache.stats()
+    })
+
+@app.route('/search')
+def search_candidates():
+    if candidate_index is None or not index_authorized():
+        return jsonify({'error': 'Not found'}), 404
+
+    role = request.args.get('role')
+    skills = request.args.get('skills')
+    try:
+        k = min(int(request.args.get('k', 10)), SEARCH_MAX_K)
+        min_years = request.args.get('min_years')
+        min_years = float(min_years) if min_years is not None else None
+    except ValueError:
+        return jsonify({'error': 'k and min_years must be numbers'}), 400
+
+    start = time.perf_counter()
+    if role:
+        if role not in candidate_index.role_terms:
+            return jsonify({'error': f'Unknown job role: {role}'}), 400
+        query = {'role': role}
+        results = candidate_index.search_role(role, k=k, min_years=min_years)
+    elif skills:
+        skill_list = [skill.strip().lower() for skill in skills.split(',') if skill.strip()]
+        query = {'skills': skill_list}
+        results = candidate_index.search(dict.fromkeys(skill_list, 1.0), k=k, min_years=min_years)
+    else:
+        return jsonify({'error': 'Provide a role or a comma separated skills list'}), 400
+
+    return responses.json_response({
+        'query': query,
+        'k': k,
+        'took_ms': round((time.perf_counter() - start) * 1000, 2),
+        'results': results
+    })
+
+@app.route('/candidates/<candidate_id>', methods=['DELETE'])
+def delete_candidate(candidate_id):
+    if candidate_index is None or not index_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    if not candidate_index.remove(candidate_id):
+        return jsonify({'error': 'Candidate not found'}), 404
+    return '', 204
+
+@app.errorhandler(UploadRejected)
+def upload_rejected(error):
+    UPLOADS_REJECTED.inc(status=error.status)
+    return jsonify({'error': str(error)}), error.status
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(error):
+    UPLOADS_REJECTED.inc(status=413)
+    return jsonify({'error': f'Request exceeds {MAX_CONTENT_LENGTH} bytes'}), 413
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    selected_role = request.form.get('job_role', 'software_engineer')
+    if selected_role not in JOB_REQUIREMENTS:
+        return jsonify({'error': f'Unknown job role: {selected_role}'}), 400
+    try:
+        fields = parse_fields(request.args.get('fields'), RESPONSE_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        items = read_batch_uploads(
+            request.files.getlist('resumes') + request.files.getlist('archive'),
+            ALLOWED_EXTENSIONS, BATCH_MAX_FILES, BATCH_MAX_FILE_BYTES, BATCH_MAX_TOTAL_BYTES
+        )
+    except zipfile.BadZipFile:
+        return jsonify({'error': 'Invalid zip archive'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not items:
+        return jsonify({'error': 'No files provided'}), 400
+
+    results = iter_batch_results(items, selected_role, fields)
+
+    # NDJSON streams each result as soon as it finishes
+    if request.args.get('stream') == '1' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        lines = (responses.dumps(result) + b'\n' for result in results)
+        return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+    results = sorted(results, key=lambda result: result['index'])
+    succeeded = sum(1 for result in results if result['status'] == 'ok')
+    return responses.json_response({
+        'job_role': selected_role,
+        'total': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results
+    })
+
+@app.route('/match', methods=['POST'])
+def match_job_descriptions():
+    job_descriptions = [text for text in request.form.getlist('job_description') if text.strip()]
+    if not job_descriptions:
+        return jsonify({'error': 'No job description provided'}), 400
+    if len(job_descriptions) > MATCH_MAX_JOB_DESCRIPTIONS:
+        return jsonify({'error': f'At most {MATCH_MAX_JOB_DESCRIPTIONS} job descriptions per request'}), 400
+    try:
+        top_k = int(request.args.get('k', request.form.get('k', 10)))
+    except ValueError:
+        return jsonify({'error': 'k must be a number'}), 400
+
+    try:
+        items = read_batch_uploads(
+            request.files.getlist('resumes') + request.files.getlist('archive'),
+            ALLOWED_EXTENSIONS, BATCH_MAX_FILES, BATCH_MAX_FILE_BYTES, BATCH_MAX_TOTAL_BYTES
+        )
+    except zipfile.BadZipFile:
+        return jsonify({'error': 'Invalid zip archive'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not items:
+        return jsonify({'error': 'No files provided'}), 400
+
+    errors = [{'index': index, 'filename': item.filename, 'error': item.error}
+              for index, item in enumerate(items) if item.error]
+    parsed_items = []
+    for index, item, parsed, error in iter_parsed(
+            (index, item) for index, item in enumerate(items) if not item.error):
+        if error:
+            errors.append({'index': index, 'filename': item.filename, 'error': error})
+        else:
+            parsed_items.append((index, item, parsed['text']))
+    parsed_items.sort(key=lambda entry: entry[0])
+
+    # Every resume against every job description in one sparse product
+    rankings = analyzers.get('jd_matcher').rank(
+        [text for _, _, text in parsed_items], job_descriptions, top_k
+    )
+    return responses.json_response({
+        'total': len(items),
+        'matches': [
+            {
+                'job_description': jd_index,
+                'results': [
+                    {'index': parsed_items[row][0], 'filename': parsed_items[row][1].filename,
+                     'candidate_id': parsed_items[row][1].sha256, 'score': score}
+                    for row, score in ranking
+                ]
+            }
+            for jd_index, ranking in enumerate(rankings)
+        ],
+        'errors': sorted(errors, key=lambda error: error['index'])
+    })
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
+
+    file = request.files['resume']
+    selected_role = request.form.get('job_role', 'software_engineer')
+
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type'}), 400
+    if selected_role not in JOB_REQUIREMENTS:
+        return jsonify({'error': f'Unknown job role: {selected_role}'}), 400
+
+    upload = receive_upload(file, UPLOAD_SPOOL_THRESHOLD, upload_limit(file.filename))
+    try:
+        data = upload.read_bytes()
+    finally:
+        upload.close()
+
+    try:
+        job = job_queue.submit(
+            run_analysis_job, data, upload.sha256, file.filename, selected_role,
+            meta={'filename': file.filename, 'job_role': selected_role}
+        )
+    except QueueFullError as e:
+        response = jsonify({'error': 'Too many pending jobs, retry later'})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
+
+    response = jsonify({'job_id': job.id, 'status': job.status, 'status_url': f'/jobs/{job.id}'})
+    response.headers['Location'] = f'/jobs/{job.id}'
+    return response, 202
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return responses.json_response(job.to_dict())
+
 @app.route('/analyze', methods=['POST'])
 def analyze_resume():
     try:
         if 'resume' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
         
+        deadline = time.monotonic() + REQUEST_DEADLINE
         file = request.files['resume']
         selected_role = request.form.get('job_role', 'software_engineer')
+        if selected_role not in JOB_REQUIREMENTS:
+            return jsonify({'error': f'Unknown job role: {selected_role}'}), 400
+        try:
+            fields = parse_fields(request.args.get('fields'), RESPONSE_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
+            upload = receive_upload(file, UPLOAD_SPOOL_THRESHOLD, upload_limit(file.filename))
+            
+            def parse():
+                # Parse resume once admission control lets this class of work run
+                try:
+                    with admission.admit(WORK_CLASSES.get(file_type(file.filename), 'light'), deadline):
+                        return parse_resume(upload.source, file.filename)
+                finally:
+                    record_admission()
+            
+            # Requested profiles skip the caches so the full pipeline shows up
+            requested = profiler.authorized(profile_token())
+            
+            def analyze():
+                try:
+                    result = analyze_cached(upload.sha256, selected_role, parse, file.filename,
+                                            refresh=requested, fields=fields)
+                    return responses.json_response(result)
+                    
+                except AdmissionRejected as e:
+                    ADMISSION_REJECTIONS.inc(work_class=e.work_class, reason=e.reason)
+                    response = jsonify({'error': 'Server is busy, retry later'})
+                    response.headers['Retry-After'] = str(e.retry_after)
+                    return response, 503
+                except Exception as e:
+                    record_error(e)
+                    print(f"Analysis error: {str(e)}")
+                    return jsonify({'error': f'Error analyzing resume: {str(e)}'}), 500
             
             try:
-                # Parse resume
-                parser = ResumeParser()
-                text = parser.extract_text(file_path)
-                sections = parser.extract_sections()
-                
-                # Extract keywords
-                extractor = KeywordExtractor()
-                keywords = extractor.extract_keywords(text)
-                
-                # Initialize suggestions list
-                suggestions = []
+                if not (requested or profiler.should_sample()):
+                    return analyze()
                 
-                # Analyze suitable job roles
-                job_analyzer = JobRoleAnalyzer()
-                role_match = job_analyzer.analyze_specific_role(text, keywords, selected_role)
-                suitable_roles = job_analyzer.analyze_job_roles(text, keywords)
-                
-                # Use the score from the selected role
-                score = role_match['confidence']
-                
-                # Generate sophisticated suggestions
-                suggestion_generator = SuggestionGenerator()
-                suggestions = suggestion_generator.generate_suggestions(
-                    role=selected_role,
-                    found_skills=set(keywords.keys()),
-                    sections=sections
-                )
-                
-                # Create job requirements structure for ATS
-                role_requirements = {
-                    'keywords': JOB_REQUIREMENTS[selected_role],
-                    'required_years': 2,  # Default requirement
-                    'weight': 1.0
-                }
-                
-                ats_analyzer = ATSAnalyzer()
-                ats_results = ats_analyzer.calculate_ats_score(
-                    text=text,
-                    role_requirements=role_requirements,
-                    sections=sections,
-                    skills_found=keywords
-                )
-                
-                # Get industry analysis
-                industry_analyzer = IndustryAnalyzer()
-                industry_analysis = industry_analyzer.analyze_industry_fit(text, keywords)
-                
-                return jsonify({
-                    'score': round(score, 2),
-                    'ats_score': ats_results['overall_score'],
-                    'ats_details': ats_results['detailed_scores'],
-                    'ats_recommendations': ats_results['recommendations'],
-                    'sections_found': sections,
-                    'keywords': keywords,
-                    'suitable_roles': suitable_roles,
-                    'suggestions': suggestions,
-                    'industry_analysis': industry_analysis
+                mode = request.args.get('profile_mode') if requested else None
+                if mode not in PROFILE_MODES:
+                    mode = None
+                response, profile = profiler.run(analyze, mode=mode, meta={
+                    'endpoint': request.path,
+                    'requested': requested,
+                    'filename': file.filename,
+                    'file_type': file_type(file.filename),
+                    'file_size': upload.size,
+                    'job_role': selected_role
                 })
-                
-            except Exception as e:
-                print(f"Analysis error: {str(e)}")
-                return jsonify({'error': f'Error analyzing resume: {str(e)}'}), 500
+                response = app.make_response(response)
+                response.headers['X-Profile-Id'] = profile.id
+                return response
             finally:
-                # Always try to clean up the uploaded file
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
+                upload.close()
         
         return jsonify({'error': 'Invalid file type'}), 400
             
+    except UploadRejected as e:
+        return upload_rejected(e)
+    except RequestEntityTooLarge as e:
+        return request_too_large(e)
     except Exception as e:
         print(f"Server error: {str(e)}")
         return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -1,13 +1,19 @@
 import os
+import sys
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-from parsers.resume_parser import ResumeParser
-from utils.keyword_extractor import KeywordExtractor
-from models.job_role_analyzer import JobRoleAnalyzer
-from models.suggestion_generator import SuggestionGenerator
-from models.ats_analyzer import ATSAnalyzer
-from models.industry_analyzer import IndustryAnalyzer
+
+# The modules use package-relative imports, so import them through the backend
+# package even when this file is run from inside backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.parsers.resume_parser import ResumeParser
+from backend.utils.keyword_extractor import KeywordExtractor
+from backend.models.job_role_analyzer import JobRoleAnalyzer
+from backend.models.suggestion_generator import SuggestionGenerator
+from backend.models.ats_analyzer import ATSAnalyzer
+from backend.models.industry_analyzer import IndustryAnalyzer
+from backend.models.job_requirements import JOB_REQUIREMENTS
 
 app = Flask(__name__)
 CORS(app)
@@ -20,25 +26,6 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 # Create uploads folder if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Sample job requirements
-JOB_REQUIREMENTS = {
-    'software_engineer': ['python', 'javascript', 'sql', 'git', 'aws'],
-    'data_scientist': ['python', 'machine learning', 'sql', 'statistics', 'tensorflow'],
-    'web_developer': ['html', 'css', 'javascript', 'react', 'node.js'],
-    'devops_engineer': ['docker', 'kubernetes', 'jenkins', 'aws', 'terraform'],
-    'mobile_developer': ['android', 'ios', 'react native', 'flutter', 'mobile testing'],
-    'cloud_architect': ['aws', 'azure', 'cloud architecture', 'microservices', 'security'],
-    'security_engineer': ['cybersecurity', 'penetration testing', 'security audit', 'encryption'],
-    'data_engineer': ['sql', 'etl', 'hadoop', 'spark', 'data warehouse'],
-    'ml_engineer': ['machine learning', 'deep learning', 'python', 'tensorflow', 'mlops'],
-    'ui_ux_designer': ['figma', 'user research', 'wireframing', 'prototyping', 'adobe xd'],
-    'qa_engineer': ['selenium', 'test automation', 'jira', 'test planning', 'api testing'],
-    'blockchain_developer': ['solidity', 'smart contracts', 'web3', 'ethereum', 'defi'],
-    'game_developer': ['unity', 'unreal engine', 'c++', 'game design', '3d modeling'],
-    'embedded_systems': ['c', 'embedded c', 'rtos', 'microcontrollers', 'firmware'],
-    'network_engineer': ['cisco', 'networking', 'tcp/ip', 'security', 'vpn']
-}
-
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
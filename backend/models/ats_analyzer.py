@@ -1,8 +1,9 @@
-import re
-from datetime import datetime
+from ..utils.text_profile import TextProfile
+from ..utils.skill_vocabulary import SKILL_VOCABULARY, popcount
 
 class ATSAnalyzer:
-    def __init__(self):
+    def __init__(self, skill_vocabulary=None):
+        self.skill_vocabulary = skill_vocabulary if skill_vocabulary is not None else SKILL_VOCABULARY
         self.scoring_weights = {
             'keyword_match': 0.30,
             'skill_relevance': 0.25,
@@ -18,8 +19,13 @@ class ATSAnalyzer:
             'skills': {'weight': 0.9, 'keywords': ['skills', 'technologies', 'tools']}
         }
 
-    def calculate_ats_score(self, text, role_requirements, sections, skills_found):
+    def calculate_ats_score(self, text, role_requirements, sections, skills_found, profile=None,
+                            context=None):
         try:
+            if profile is None:
+                profile = context.profile if context is not None else TextProfile(text)
+            normalized_text = context.normalized_text if context is not None else text.lower()
+            
             requirements = {
                 'keywords': list(role_requirements.get('keywords', [])),
                 'required_skills': list(role_requirements.get('keywords', [])),
@@ -27,11 +33,11 @@ class ATSAnalyzer:
             }
             
             scores = {
-                'keyword_match': self._calculate_keyword_match(text, requirements),
+                'keyword_match': self._calculate_keyword_match(normalized_text, requirements),
                 'skill_relevance': self._calculate_skill_relevance(skills_found, requirements),
                 'section_completeness': self._calculate_section_score(sections),
-                'format_quality': self._analyze_format_quality(text),
-                'experience_match': self._analyze_experience_match(text, requirements)
+                'format_quality': self._analyze_format_quality(text, profile),
+                'experience_match': self._analyze_experience_match(text, requirements, profile)
             }
             
             final_score = sum(
@@ -57,8 +63,8 @@ class ATSAnalyzer:
             }
 
     def _calculate_keyword_match(self, text, requirements):
+        # Expects lowercased text
         try:
-            text = text.lower()
             total_keywords = len(requirements['keywords'])
             if total_keywords == 0:
                 return 50.0
@@ -73,14 +79,16 @@ class ATSAnalyzer:
             if not requirements.get('required_skills') or not skills_found:
                 return 50.0
             
-            required_skills = {str(skill).lower() for skill in requirements['required_skills']}
-            found_skills = {str(skill).lower() for skill in skills_found.keys()}
+            # Requirements and found skills are masked against the shared
+            # vocabulary and matched with AND + popcount. Requirements are not
+            # compiled, as callers may pass their own; a required skill the
+            # vocabulary does not know still counts as missing.
+            vocabulary = self.skill_vocabulary
+            required = {str(skill).lower() for skill in requirements['required_skills']}
+            required_skills = vocabulary.mask(required)
+            found_skills = vocabulary.mask(str(skill).lower() for skill in skills_found.keys())
             
-            if not required_skills:
-                return 50.0
-                
-            matched_skills = required_skills.intersection(found_skills)
-            return float(len(matched_skills) / len(required_skills) * 100)
+            return float(popcount(required_skills & found_skills) / len(required) * 100)
         except Exception:
             return 50.0
 
@@ -98,8 +106,11 @@ class ATSAnalyzer:
         except Exception:
             return 50.0
 
-    def _analyze_format_quality(self, text):
+    def _analyze_format_quality(self, text, profile=None):
         try:
+            if profile is None:
+                profile = TextProfile(text)
+            
             format_score = 100.0
             penalties = {
                 'long_paragraphs': 10,
@@ -108,39 +119,32 @@ class ATSAnalyzer:
                 'complex_formatting': 10
             }
             
-            if len(max(text.split('\n'), key=len, default='')) > 500:
+            if profile.longest_line > 500:
                 format_score -= penalties['long_paragraphs']
             
-            if '\t' in text or '  ' in text:
+            if profile.has_tabs or profile.has_double_spaces:
                 format_score -= penalties['inconsistent_spacing']
                 
-            special_chars = sum(1 for char in text if not char.isalnum() 
-                              and char not in ' .,()-:;/')
-            if special_chars > 20:
+            if profile.special_char_count > 20:
                 format_score -= penalties['special_characters']
                 
             return max(0.0, float(format_score))
         except Exception:
             return 50.0
 
-    def _analyze_experience_match(self, text, requirements):
+    def _analyze_experience_match(self, text, requirements, profile=None):
         try:
-            required_years = float(requirements.get('required_years', 0))
-            years_found = []
-            
-            # Extract years of experience
-            year_matches = re.findall(r'(\d+)[\+]?\s*(?:years?|yrs?)', text, re.IGNORECASE)
-            years_found.extend(int(year) for year in year_matches if year.isdigit())
+            if profile is None:
+                profile = TextProfile(text)
             
-            # Extract from date ranges
-            date_ranges = re.findall(r'(\d{4})\s*-\s*(?:present|current|\d{4})', text, re.IGNORECASE)
-            current_year = datetime.now().year
-            years_found.extend(current_year - int(year) for year in date_ranges if year.isdigit())
+            required_years = float(requirements.get('required_years', 0))
             
-            if not years_found:
+            # Longest stated experience or date range
+            years_found = profile.years_of_experience()
+            if years_found is None:
                 return 50.0
                 
-            max_years = float(max(years_found))
+            max_years = float(years_found)
             if max_years >= required_years:
                 return 100.0
             return float(max_years / required_years * 100)
@@ -1,116 +1,175 @@
 import json
+import math
 import os
-from collections import Counter
+from collections import defaultdict
+from functools import lru_cache
+from ..utils.skill_matcher import SkillMatcher
+from ..utils.skill_vocabulary import SKILL_VOCABULARY, popcount
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# Used when the data files are missing
+DEFAULT_INDUSTRY_PATTERNS = {
+    'Technology': ['software', 'technology', 'programming', 'development', 'developer', 'developers', 'develop',
+                   'developed', 'engineer', 'engineers', 'engineering', 'computer science'],
+    'Finance': ['banking', 'finance', 'investment', 'trading', 'financial'],
+    'Healthcare': ['medical', 'healthcare', 'clinical', 'health', 'patient'],
+    'Manufacturing': ['manufacturing', 'production', 'industrial', 'assembly'],
+    'Retail': ['retail', 'sales', 'customer service', 'merchandising'],
+    'Education': ['education', 'teaching', 'academic', 'training'],
+}
+
+DEFAULT_INDUSTRY_BENCHMARKS = {
+    'Technology': {
+        'required_skills': ['programming', 'software development', 'agile'],
+        'preferred_skills': ['cloud computing', 'devops', 'machine learning']
+    },
+    'Finance': {
+        'required_skills': ['financial analysis', 'excel', 'modeling'],
+        'preferred_skills': ['python', 'sql', 'risk management']
+    },
+}
+
+@lru_cache(maxsize=None)
+def _load_data_file(filename):
+    # Read once per process; callers must treat the result as read-only
+    with open(os.path.join(DATA_DIR, filename), 'r') as f:
+        return json.load(f)
 
 class IndustryAnalyzer:
-    def __init__(self):
-        self.industry_patterns = {
-            'Technology': ['software', 'technology', 'programming', 'development', 'IT'],
-            'Finance': ['banking', 'finance', 'investment', 'trading', 'financial'],
-            'Healthcare': ['medical', 'healthcare', 'clinical', 'health', 'patient'],
-            'Manufacturing': ['manufacturing', 'production', 'industrial', 'assembly'],
-            'Retail': ['retail', 'sales', 'customer service', 'merchandising'],
-            'Education': ['education', 'teaching', 'academic', 'training'],
-        }
-        
-        self.benchmarks = {
-            'Technology': {
-                'required_skills': ['programming', 'software development', 'agile'],
-                'preferred_skills': ['cloud computing', 'devops', 'machine learning']
-            },
-            'Finance': {
-                'required_skills': ['financial analysis', 'excel', 'modeling'],
-                'preferred_skills': ['python', 'sql', 'risk management']
-            },
-            # Add more industry benchmarks as needed
+    def __init__(self, skill_vocabulary=None):
+        self.skill_vocabulary = skill_vocabulary if skill_vocabulary is not None else SKILL_VOCABULARY
+        self.industry_patterns = self.load_industry_patterns()
+        self.benchmarks = self.load_industry_benchmarks()
+        self._build_term_index()
+        # Required skills of each benchmark as a bitmask over the shared
+        # skill vocabulary
+        self.required_masks = {
+            industry: self._required_mask(benchmark) for industry, benchmark in self.benchmarks.items()
         }
 
     def load_industry_patterns(self):
+        # Each industry maps to a list of terms or to {term: weight}
         try:
-            with open('backend/data/industry_patterns.json', 'r') as f:
-                return json.load(f)
+            return _load_data_file('industry_patterns.json')
         except FileNotFoundError:
             print("Warning: industry_patterns.json not found. Using default patterns.")
-            return {
-                "Technology": [
-                    "Software", "Development", "Programming", "IT", "Technical"
-                ],
-                "Finance": [
-                    "Banking", "Investment", "Trading", "Financial", "Accounting"
-                ],
-                "Healthcare": [
-                    "Medical", "Clinical", "Healthcare", "Patient", "Hospital"
-                ]
-            }
+            return DEFAULT_INDUSTRY_PATTERNS
 
     def load_industry_benchmarks(self):
         try:
-            with open('backend/data/industry_benchmarks.json', 'r') as f:
-                return json.load(f)
+            return _load_data_file('industry_benchmarks.json')
         except FileNotFoundError:
             print("Warning: industry_benchmarks.json not found. Using default benchmarks.")
-            return {
-                "Technology": {
-                    "required_skills": ["Programming", "Software Development"],
-                    "minimum_experience": 2,
-                    "skill_weights": {
-                        "technical_skills": 0.6,
-                        "soft_skills": 0.2,
-                        "tools": 0.2
-                    }
-                }
-            }
-
-    def detect_industry(self, text):
-        industry_scores = {}
+            return DEFAULT_INDUSTRY_BENCHMARKS
+
+    def _build_term_index(self):
+        # Inverted index term -> [(industry, weight)] behind one compiled
+        # matcher, so detection costs one scan plus work per matched term no
+        # matter how many industries and terms the taxonomy holds
+        self.industries = list(self.industry_patterns)
+        self.term_index = defaultdict(list)
         for industry, patterns in self.industry_patterns.items():
-            score = sum(1 for pattern in patterns if pattern.lower() in text.lower())
-            industry_scores[industry] = score
+            weights = patterns if isinstance(patterns, dict) else dict.fromkeys(patterns, 1.0)
+            for term, weight in weights.items():
+                self.term_index[term.lower()].append((industry, float(weight)))
+        self.term_matcher = SkillMatcher(self.term_index)
+
+    def _heading_counts(self, lowered_text):
+        # A term alone on its line or before a colon is a section heading
+        # ("Education", "Training:"). Nearly every resume has those whatever
+        # its industry, so they are not counted as industry evidence.
+        headings = defaultdict(int)
+        for line in lowered_text.split('\n'):
+            heading = line.partition(':')[0].strip()
+            if heading in self.term_index:
+                headings[heading] += 1
+        return headings
+
+    def detect_industry(self, text, context=None):
+        if context is not None:
+            lowered_text = context.normalized_text
+            term_counts = context.term_counts(self.term_matcher)
+        else:
+            lowered_text = text.lower()
+            term_counts = self.term_matcher.count(lowered_text)
+        headings = self._heading_counts(lowered_text)
+
+        # Each matched term adds its weight scaled by a sublinear term frequency
+        industry_scores = dict.fromkeys(self.industries, 0.0)
+        for term, count in term_counts.items():
+            count -= headings.get(term, 0)
+            if count <= 0:
+                continue
+            for industry, weight in self.term_index.get(term, ()):
+                industry_scores[industry] += weight * (1 + math.log(count))
         
         # Return industry with highest score, default to "Technology" if no matches
         if not industry_scores or max(industry_scores.values()) == 0:
             return "Technology"
         return max(industry_scores.items(), key=lambda x: x[1])[0]
 
+    def _required_mask(self, benchmark):
+        return self.skill_vocabulary.compile(benchmark.get('required_skills', [])) if benchmark else 0
+
+    def _match_score(self, found, required):
+        # found and required are skill bitmasks
+        if not required:
+            return 50
+        score = popcount(required & found) / popcount(required) * 100
+        return min(100, max(0, score))
+
+    def _recommendations(self, missing_skills):
+        recommendations = []
+        
+        if missing_skills:
+            recommendations.append(f"Consider acquiring these skills: {', '.join(missing_skills)}")
+        
+        return recommendations or ["No specific recommendations at this time."]
+
+    # The benchmark passed to these may be any caller's, so its skills are
+    # masked rather than compiled; skills the vocabulary does not know are
+    # always missing
     def calculate_match_score(self, skills, benchmark):
         if not benchmark or not skills:
             return 50  # Default score if no benchmark or skills
-        
-        required_skills = set(benchmark.get('required_skills', []))
-        candidate_skills = set(skills.keys())
-        
-        matched_skills = required_skills.intersection(candidate_skills)
-        score = (len(matched_skills) / len(required_skills)) * 100 if required_skills else 50
-        
+        required = set(benchmark.get('required_skills', []))
+        if not required:
+            return 50
+        found = self.skill_vocabulary.mask(skills)
+        score = popcount(self.skill_vocabulary.mask(required) & found) / len(required) * 100
         return min(100, max(0, score))
 
     def identify_missing_skills(self, skills, benchmark):
         if not benchmark or not skills:
             return []
-            
-        required_skills = set(benchmark.get('required_skills', []))
-        candidate_skills = set(skills.keys())
-        
-        return list(required_skills - candidate_skills)
+        vocabulary = self.skill_vocabulary
+        required = set(benchmark.get('required_skills', []))
+        unknown = sorted(skill for skill in required if skill not in vocabulary)
+        return vocabulary.terms_of(vocabulary.mask(required) & ~vocabulary.mask(skills)) + unknown
 
     def generate_recommendations(self, skills, benchmark):
-        recommendations = []
-        missing_skills = self.identify_missing_skills(skills, benchmark)
-        
-        if missing_skills:
-            recommendations.append(f"Consider acquiring these skills: {', '.join(missing_skills)}")
-        
-        return recommendations or ["No specific recommendations at this time."]
+        return self._recommendations(self.identify_missing_skills(skills, benchmark))
 
-    def analyze_industry_fit(self, resume_text, skills):
-        detected_industry = self.detect_industry(resume_text)
-        benchmark = self.benchmarks.get(detected_industry, {})
+    def analyze_industry_fit(self, resume_text, skills, context=None):
+        detected_industry = self.detect_industry(resume_text, context)
+        
+        # Score and gaps from the benchmark's precompiled mask and one mask
+        # of the candidate's skills
+        if self.benchmarks.get(detected_industry) and skills:
+            found = self.skill_vocabulary.mask(skills)
+            required = self.required_masks[detected_industry]
+            match_score = self._match_score(found, required)
+            missing_skills = self.skill_vocabulary.terms_of(required & ~found)
+        else:
+            match_score = 50  # Default score if no benchmark or skills
+            missing_skills = []
         
         analysis = {
             'industry': detected_industry,
-            'match_score': self.calculate_match_score(skills, benchmark),
-            'missing_skills': self.identify_missing_skills(skills, benchmark),
-            'recommendations': self.generate_recommendations(skills, benchmark)
+            'match_score': match_score,
+            'missing_skills': missing_skills,
+            'recommendations': self._recommendations(missing_skills)
         }
         
         return analysis 
\ No newline at end of file
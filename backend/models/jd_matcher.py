@@ -0,0 +1,193 @@
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from ..utils.result_cache import LRUTTLCache
+
+# Words plus technical tokens such as c++, c#, node.js and ci/cd
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*')
+
+# Job description n-grams that start or end with one of these are dropped
+STOP_WORDS = frozenset({
+    'a', 'about', 'all', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do',
+    'for', 'from', 'has', 'have', 'in', 'is', 'it', 'its', 'join', 'of', 'on',
+    'or', 'our', 'that', 'the', 'their', 'this', 'to', 'we', 'will', 'with',
+    'you', 'your', 'who', 'what', 'which', 'while', 'would', 'should', 'must',
+    'plus', 'role', 'team', 'work', 'working', 'looking', 'ability', 'strong'
+})
+
+# Longest word n-gram taken from job descriptions
+JD_MAX_NGRAM = 2
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class JobDescription:
+    # A fitted job description: its n-gram and taxonomy term counts
+    def __init__(self, text, taxonomy, max_n):
+        self.text = text
+        self.hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        tokens = tokenize(text)
+
+        counts = Counter()
+        for n in range(1, max(JD_MAX_NGRAM, max_n) + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = ' '.join(tokens[i:i + n])
+                if gram in taxonomy or (
+                        n <= JD_MAX_NGRAM and tokens[i] not in STOP_WORDS and
+                        tokens[i + n - 1] not in STOP_WORDS and not gram.isdigit()):
+                    counts[gram] += 1
+        self.term_counts = dict(counts)
+
+
+class Vocabulary:
+    # Terms of the taxonomy plus a set of job descriptions. Single words and
+    # word pairs are counted with C-level Counters; only the rare positions
+    # that start a longer term are walked in Python.
+    def __init__(self, terms):
+        self.terms = sorted(terms)
+        self.index = {term: i for i, term in enumerate(self.terms)}
+        self.term_set = frozenset(self.terms)
+        # Two-word beginnings of terms with three or more words
+        self.long_prefixes = set()
+        self.max_words = 1
+        for term in self.terms:
+            words = term.split(' ')
+            self.max_words = max(self.max_words, len(words))
+            if len(words) > 2:
+                self.long_prefixes.add(' '.join(words[:2]))
+
+    def count(self, text):
+        # Term column -> count for one document, and its length in tokens
+        tokens = tokenize(text)
+        bigrams = list(map(' '.join, zip(tokens, tokens[1:])))
+        index = self.index
+
+        counts = Counter()
+        for grams in (Counter(tokens), Counter(bigrams)):
+            for gram in self.term_set.intersection(grams):
+                counts[index[gram]] = grams[gram]
+
+        if self.long_prefixes.intersection(bigrams):
+            for i, bigram in enumerate(bigrams):
+                if bigram not in self.long_prefixes:
+                    continue
+                gram = bigram
+                for token in tokens[i + 2:i + self.max_words]:
+                    gram = gram + ' ' + token
+                    column = index.get(gram)
+                    if column is not None:
+                        counts[column] += 1
+        return counts, len(tokens)
+
+
+class JDMatcher:
+    # Scores resumes against free-text job descriptions: BM25-weighted resume
+    # vectors against idf-weighted job description vectors, compared by cosine
+    # similarity. All pairs are scored with one sparse matrix product.
+    def __init__(self, taxonomy_terms, cache_size=64, cache_ttl=3600):
+        self.taxonomy = frozenset(' '.join(tokenize(term)) for term in taxonomy_terms) - {''}
+        self.max_n = max((term.count(' ') + 1 for term in self.taxonomy), default=1)
+        # Fitted job descriptions by text hash, and vocabularies by the set of
+        # job descriptions they cover
+        self._fitted = LRUTTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._vocabularies = LRUTTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def fit(self, text):
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        job = self._fitted.get(key)
+        if job is None:
+            job = JobDescription(text, self.taxonomy, self.max_n)
+            self._fitted.set(key, job)
+        return job
+
+    def vocabulary(self, jobs):
+        key = tuple(sorted(job.hash for job in jobs))
+        vocabulary = self._vocabularies.get(key)
+        if vocabulary is None:
+            terms = set(self.taxonomy)
+            for job in jobs:
+                terms.update(job.term_counts)
+            vocabulary = Vocabulary(terms)
+            self._vocabularies.set(key, vocabulary)
+        return vocabulary
+
+    def _count_matrix(self, documents, vocabulary):
+        # documents are texts or already counted (column counts, length) pairs
+        rows, columns, values, lengths = [], [], [], []
+        for row, document in enumerate(documents):
+            counts, length = vocabulary.count(document) if isinstance(document, str) else document
+            rows.extend([row] * len(counts))
+            columns.extend(counts.keys())
+            values.extend(counts.values())
+            lengths.append(length)
+        matrix = sparse.csr_matrix(
+            (np.array(values, dtype=np.float64), (rows, columns)),
+            shape=(len(documents), len(vocabulary.terms))
+        )
+        return matrix, np.array(lengths, dtype=np.float64)
+
+    def score(self, resume_texts, jd_texts):
+        # Cosine similarity of every resume (rows) with every job description
+        # (columns), scaled to 0-100
+        jobs = [self.fit(text) for text in jd_texts]
+        vocabulary = self.vocabulary(jobs)
+
+        resumes, lengths = self._count_matrix(resume_texts, vocabulary)
+        job_documents = [
+            ({vocabulary.index[term]: count for term, count in job.term_counts.items()},
+             sum(job.term_counts.values()))
+            for job in jobs
+        ]
+        job_matrix, _ = self._count_matrix(job_documents, vocabulary)
+
+        # BM25 idf over resumes and job descriptions together
+        documents = resumes.shape[0] + job_matrix.shape[0]
+        df = resumes.getnnz(axis=0) + job_matrix.getnnz(axis=0)
+        idf = np.log(1 + (documents - df + 0.5) / (df + 0.5))
+
+        # BM25 term frequency saturation with document length normalization
+        if resumes.nnz:
+            average_length = max(lengths.mean(), 1.0)
+            row_lengths = np.repeat(lengths, np.diff(resumes.indptr))
+            tf = resumes.data
+            resumes.data = tf * (BM25_K1 + 1) / (
+                tf + BM25_K1 * (1 - BM25_B + BM25_B * row_lengths / average_length))
+        resumes = _normalize_rows(resumes @ sparse.diags(idf))
+
+        job_matrix.data = 1 + np.log(job_matrix.data)
+        job_matrix = _normalize_rows(job_matrix @ sparse.diags(idf))
+
+        return np.asarray((resumes @ job_matrix.T).todense()) * 100
+
+    def rank(self, resume_texts, jd_texts, top_k=10):
+        # Per job description, the top_k (resume index, score) pairs
+        scores = self.score(resume_texts, jd_texts)
+        top_k = min(top_k, scores.shape[0])
+        if top_k <= 0:
+            return [[] for _ in range(scores.shape[1])]
+        rankings = []
+        for column in range(scores.shape[1]):
+            column_scores = scores[:, column]
+            if top_k < len(column_scores):
+                top = np.argpartition(-column_scores, top_k - 1)[:top_k]
+            else:
+                top = np.arange(len(column_scores))
+            top = top[np.argsort(-column_scores[top], kind='stable')]
+            rankings.append([(int(i), round(float(column_scores[i]), 2)) for i in top])
+        return rankings
+
+
+def _normalize_rows(matrix):
+    matrix = sparse.csr_matrix(matrix)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
@@ -0,0 +1,18 @@
+# Sample job requirements, shared by the app and the ATS stage
+JOB_REQUIREMENTS = {
+    'software_engineer': ['python', 'javascript', 'sql', 'git', 'aws'],
+    'data_scientist': ['python', 'machine learning', 'sql', 'statistics', 'tensorflow'],
+    'web_developer': ['html', 'css', 'javascript', 'react', 'node.js'],
+    'devops_engineer': ['docker', 'kubernetes', 'jenkins', 'aws', 'terraform'],
+    'mobile_developer': ['android', 'ios', 'react native', 'flutter', 'mobile testing'],
+    'cloud_architect': ['aws', 'azure', 'cloud architecture', 'microservices', 'security'],
+    'security_engineer': ['cybersecurity', 'penetration testing', 'security audit', 'encryption'],
+    'data_engineer': ['sql', 'etl', 'hadoop', 'spark', 'data warehouse'],
+    'ml_engineer': ['machine learning', 'deep learning', 'python', 'tensorflow', 'mlops'],
+    'ui_ux_designer': ['figma', 'user research', 'wireframing', 'prototyping', 'adobe xd'],
+    'qa_engineer': ['selenium', 'test automation', 'jira', 'test planning', 'api testing'],
+    'blockchain_developer': ['solidity', 'smart contracts', 'web3', 'ethereum', 'defi'],
+    'game_developer': ['unity', 'unreal engine', 'c++', 'game design', '3d modeling'],
+    'embedded_systems': ['c', 'embedded c', 'rtos', 'microcontrollers', 'firmware'],
+    'network_engineer': ['cisco', 'networking', 'tcp/ip', 'security', 'vpn']
+}
@@ -1,8 +1,9 @@
-from collections import defaultdict
-import re
+import numpy as np
+from ..utils.skill_vocabulary import SKILL_VOCABULARY
 
 class JobRoleAnalyzer:
-    def __init__(self):
+    def __init__(self, skill_vocabulary=None):
+        self.skill_vocabulary = skill_vocabulary if skill_vocabulary is not None else SKILL_VOCABULARY
         # Define job roles and their associated keywords
         self.job_roles = {
             'software_engineer': {
@@ -144,71 +145,125 @@ class JobRoleAnalyzer:
             }
         }
 
-    def analyze_job_roles(self, text, skills_found):
-        text = text.lower()
-        scores = defaultdict(float)
-        
-        for role, details in self.job_roles.items():
-            # Calculate keyword match score
-            keyword_matches = sum(1 for keyword in details['keywords'] 
-                                if keyword.lower() in text)
-            base_score = (keyword_matches / len(details['keywords'])) * 100
-            
-            # Calculate skill match score using the skills dictionary
-            if skills_found:
-                skill_matches = sum(1 for skill in skills_found.keys() 
-                                  if any(kw in skill.lower() for kw in details['keywords']))
-                skill_score = (skill_matches / len(details['keywords'])) * 100
-            else:
-                skill_score = 0
-            
-            # Combined weighted score
-            final_score = (base_score * 0.4 + skill_score * 0.6) * details['weight']
-            if final_score > 20:  # Only include roles with >20% match
-                scores[role] = final_score
-
-        # Sort roles by score
-        sorted_roles = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        
-        roles_with_confidence = [
-            {
-                'role': role,
-                'confidence': min(100, score),  # Cap at 100%
-                'requirements': sorted(list(self.job_roles[role]['keywords']))[:8],  # Top 8 requirements
-                'matched_keywords': [kw for kw in self.job_roles[role]['keywords'] 
-                                   if kw.lower() in text or 
-                                   any(kw.lower() in skill.lower() for skill in skills_found.keys())]
-            }
-            for role, score in sorted_roles
-        ]
+        self._build_role_matrix()
+
+    def _build_role_matrix(self):
+        # Role x keyword incidence matrix over the union of all role keywords,
+        # so every role is scored by one matrix product instead of nested loops
+        self.role_names = list(self.job_roles)
+        self.role_index = {role: i for i, role in enumerate(self.role_names)}
+        # matched_keywords are read back from the bitmasks below, so they come
+        # out in skill vocabulary id order, not in each role's keyword order
+        self.role_keywords = {role: list(details['keywords']) for role, details in self.job_roles.items()}
+        self.vocabulary = sorted({
+            keyword.lower() for keywords in self.role_keywords.values() for keyword in keywords
+        })
+        self.keyword_index = {keyword: i for i, keyword in enumerate(self.vocabulary)}
+
+        self.incidence = np.zeros((len(self.role_names), len(self.vocabulary)))
+        for row, role in enumerate(self.role_names):
+            for keyword in self.role_keywords[role]:
+                self.incidence[row, self.keyword_index[keyword.lower()]] = 1.0
+        self.keyword_totals = self.incidence.sum(axis=1)
+        self.role_weights = np.array([self.job_roles[role]['weight'] for role in self.role_names])
+
+        # Each role's keywords as a bitmask over the shared skill vocabulary,
+        # and the bit of every matrix column, so matched keywords come from
+        # one AND per role
+        self.role_masks = {
+            role: self.skill_vocabulary.compile(keyword.lower() for keyword in keywords)
+            for role, keywords in self.role_keywords.items()
+        }
+        self.column_bits = [1 << self.skill_vocabulary.intern(keyword) for keyword in self.vocabulary]
+        self.role_requirements = {role: sorted(keywords)[:8] for role, keywords in self.role_keywords.items()}
+
+    def _text_presence(self, texts):
+        # Resumes x keywords: keyword appears anywhere in the lowercased text
+        presence = np.zeros((len(texts), len(self.vocabulary)), dtype=bool)
+        for row, text in enumerate(texts):
+            presence[row] = [keyword in text for keyword in self.vocabulary]
+        return presence
+
+    def _skill_hits(self, skills_found_list):
+        # One row per found skill (across all resumes) marking the keywords it
+        # contains, plus the index of the resume each row belongs to
+        rows, owners = [], []
+        for owner, skills_found in enumerate(skills_found_list):
+            for skill in (skills_found or {}).keys():
+                skill = skill.lower()
+                rows.append([keyword in skill for keyword in self.vocabulary])
+                owners.append(owner)
+        hits = np.array(rows, dtype=bool).reshape(len(rows), len(self.vocabulary))
+        return hits, np.array(owners, dtype=int)
+
+    def _score_matrix(self, texts, skills_found_list):
+        # Expects lowercased texts; returns (resumes x roles) scores and
+        # (resumes x keywords) matches
+        presence = self._text_presence(texts)
+        skill_hits, owners = self._skill_hits(skills_found_list)
+
+        keyword_matches = presence @ self.incidence.T
+        base_scores = (keyword_matches / self.keyword_totals) * 100
+
+        # A found skill counts towards a role when it contains any of the
+        # role's keywords
+        skill_role_hits = (skill_hits @ self.incidence.T) > 0
+        skill_matches = np.zeros((len(texts), len(self.role_names)))
+        np.add.at(skill_matches, owners, skill_role_hits)
+        skill_scores = (skill_matches / self.keyword_totals) * 100
+
+        scores = (base_scores * 0.4 + skill_scores * 0.6) * self.role_weights
 
-        return roles_with_confidence[:3]  # Return top 3 matching roles
-
-    def analyze_specific_role(self, text, skills_found, role):
-        text = text.lower()
-        details = self.job_roles[role]
-        
-        # Calculate keyword match score
-        keyword_matches = sum(1 for keyword in details['keywords'] 
-                            if keyword.lower() in text)
-        base_score = (keyword_matches / len(details['keywords'])) * 100
-        
-        # Calculate skill match score
-        if skills_found:
-            skill_matches = sum(1 for skill in skills_found.keys() 
-                              if any(kw in skill.lower() for kw in details['keywords']))
-            skill_score = (skill_matches / len(details['keywords'])) * 100
-        else:
-            skill_score = 0
-        
-        # Combined weighted score
-        final_score = (base_score * 0.4 + skill_score * 0.6) * details['weight']
-        
+        matched = presence.copy()
+        if len(owners):
+            np.logical_or.at(matched, owners, skill_hits)
+        return scores, matched
+
+    def _matched_mask(self, matched):
+        # Skill bitmask of one resume's row of matched matrix columns
+        mask = 0
+        for column in np.flatnonzero(matched):
+            mask |= self.column_bits[column]
+        return mask
+
+    def _role_result(self, role, score, matched_mask):
         return {
             'role': role,
-            'confidence': min(100, final_score),  # Cap at 100%
-            'requirements': sorted(list(details['keywords']))[:8],
-            'matched_keywords': [kw for kw in details['keywords'] 
-                               if kw.lower() in text or 
-                               any(kw.lower() in skill.lower() for skill in skills_found.keys())]
-        }
\ No newline at end of file
+            'confidence': min(100, float(score)),  # Cap at 100%
+            'requirements': list(self.role_requirements[role]),  # Top 8 requirements
+            'matched_keywords': self.skill_vocabulary.terms_of(self.role_masks[role] & matched_mask)
+        }
+
+    def score_batch(self, texts, skills_found_list):
+        # Confidence of every resume for every role (columns follow
+        # self.role_names), computed with matrix-matrix products
+        scores, _ = self._score_matrix([text.lower() for text in texts], skills_found_list)
+        return np.minimum(scores, 100)
+
+    def _scores_for(self, text, skills_found, context):
+        # Both role analyses of a request share one scoring pass
+        if context is None:
+            return self._score_matrix([text.lower()], [skills_found])
+        return context.memo(
+            ('role_scores', id(self)),
+            lambda: self._score_matrix([context.normalized_text], [skills_found])
+        )
+
+    def analyze_job_roles(self, text, skills_found, context=None):
+        scores, matched = self._scores_for(text, skills_found, context)
+        scores, matched_mask = scores[0], self._matched_mask(matched[0])
+
+        # Only include roles with >20% match, sorted by score
+        candidates = [(role, scores[i]) for i, role in enumerate(self.role_names) if scores[i] > 20]
+        sorted_roles = sorted(candidates, key=lambda x: x[1], reverse=True)
+
+        roles_with_confidence = [
+            self._role_result(role, score, matched_mask)
+            for role, score in sorted_roles[:3]
+        ]
+
+        return roles_with_confidence  # Top 3 matching roles
+
+    def analyze_specific_role(self, text, skills_found, role, context=None):
+        scores, matched = self._scores_for(text, skills_found, context)
+        return self._role_result(role, scores[0][self.role_index[role]], self._matched_mask(matched[0]))
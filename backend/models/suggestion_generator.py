@@ -1,8 +1,10 @@
 from typing import Dict, List, Set
 import random
+from ..utils.skill_vocabulary import SKILL_VOCABULARY
 
 class SuggestionGenerator:
-    def __init__(self):
+    def __init__(self, skill_vocabulary=None):
+        self.skill_vocabulary = skill_vocabulary if skill_vocabulary is not None else SKILL_VOCABULARY
         self.skill_importance = {
             'software_engineer': {
                 'critical': {'python', 'java', 'javascript', 'data structures', 'algorithms'},
@@ -80,6 +82,11 @@ class SuggestionGenerator:
                 'bonus': {'network protocols', 'network monitoring', 'network architecture'}
             }
         }
+        # Every tier as a bitmask over the shared skill vocabulary
+        self.tier_masks = {
+            role: {tier: self.skill_vocabulary.compile(skills) for tier, skills in tiers.items()}
+            for role, tiers in self.skill_importance.items()
+        }
         
         self.improvement_templates = {
             'missing_critical': [
@@ -119,12 +126,13 @@ class SuggestionGenerator:
                            sections: Dict[str, bool]) -> List[Dict]:
         suggestions = []
         
-        # Analyze skill gaps
-        if role in self.skill_importance:
-            role_skills = self.skill_importance[role]
+        # Analyze skill gaps: each tier's missing skills are tier AND NOT found
+        if role in self.tier_masks:
+            role_skills = self.tier_masks[role]
+            found = self.skill_vocabulary.mask(found_skills)
             
             # Check critical skills
-            missing_critical = role_skills['critical'] - found_skills
+            missing_critical = role_skills['critical'] & ~found
             if missing_critical:
                 suggestions.append({
                     'type': 'critical',
@@ -132,31 +140,31 @@ class SuggestionGenerator:
                     'title': 'Critical Skills Gap',
                     'message': random.choice(self.improvement_templates['missing_critical']).format(
                         role=role.replace('_', ' '),
-                        skills=', '.join(missing_critical)
+                        skills=', '.join(self.skill_vocabulary.terms_of(missing_critical))
                     )
                 })
             
             # Check important skills
-            missing_important = role_skills['important'] - found_skills
+            missing_important = role_skills['important'] & ~found
             if missing_important:
                 suggestions.append({
                     'type': 'important',
                     'icon': '📈',
                     'title': 'Important Skills',
                     'message': random.choice(self.improvement_templates['missing_important']).format(
-                        skills=', '.join(missing_important)
+                        skills=', '.join(self.skill_vocabulary.terms_of(missing_important))
                     )
                 })
             
             # Check bonus skills
-            missing_bonus = role_skills['bonus'] - found_skills
+            missing_bonus = role_skills['bonus'] & ~found
             if missing_bonus:
                 suggestions.append({
                     'type': 'bonus',
                     'icon': '🌟',
                     'title': 'Bonus Skills',
                     'message': random.choice(self.improvement_templates['missing_bonus']).format(
-                        skills=', '.join(missing_bonus)
+                        skills=', '.join(self.skill_vocabulary.terms_of(missing_bonus))
                     )
                 })
 
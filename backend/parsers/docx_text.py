@@ -0,0 +1,94 @@
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+# Streams the text of a .docx straight out of its zip with an incremental
+# XML parser, without building python-docx's object model. Unlike
+# python-docx's doc.paragraphs it also reaches paragraphs inside tables,
+# text boxes, headers and footers.
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+RELATIONSHIPS = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS = 'word/_rels/document.xml.rels'
+
+PARAGRAPH = W + 'p'
+TEXT = W + 't'
+# Run content that stands for whitespace
+BREAKS = {W + 'tab': '\t', W + 'br': '\n', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+# Legacy VML copy of content already present in the matching mc:Choice
+FALLBACK = MC + 'Fallback'
+
+
+def _part_paths(archive):
+    # Header parts, the main document, then footer parts, as listed in the
+    # document relationships
+    headers, footers = [], []
+    try:
+        with archive.open(DOCUMENT_RELS) as rels:
+            for _, element in iterparse(rels):
+                if element.tag != RELATIONSHIPS or element.get('TargetMode') == 'External':
+                    continue
+                kind = element.get('Type', '').rsplit('/', 1)[-1]
+                target = element.get('Target', '')
+                # Relative targets start from word/, absolute ones from the package root
+                if target.startswith('/'):
+                    path = posixpath.normpath(target.lstrip('/'))
+                else:
+                    path = posixpath.normpath(posixpath.join('word', target))
+                if kind == 'header':
+                    headers.append(path)
+                elif kind == 'footer':
+                    footers.append(path)
+    except KeyError:
+        pass
+    names = set(archive.namelist())
+    return [path for path in headers if path in names] + [DOCUMENT_PART] + \
+        [path for path in footers if path in names]
+
+
+def _iter_part(stream):
+    # Yields the part's paragraphs in document order. Paragraphs nest when a
+    # text box sits inside one, so each open paragraph gets its own buffer.
+    paragraphs = []
+    skipped = 0
+    for event, element in iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == FALLBACK:
+                skipped += 1
+            elif tag == PARAGRAPH and not skipped:
+                paragraphs.append([])
+            continue
+
+        if tag == FALLBACK:
+            skipped -= 1
+        elif skipped:
+            pass
+        elif tag == TEXT:
+            if paragraphs and element.text:
+                paragraphs[-1].append(element.text)
+        elif tag in BREAKS:
+            if paragraphs:
+                paragraphs[-1].append(BREAKS[tag])
+        elif tag == PARAGRAPH:
+            yield ''.join(paragraphs.pop())
+            element.clear()
+
+
+def iter_docx_paragraphs(source):
+    # source is a path or a seekable binary file object
+    with zipfile.ZipFile(source) as archive:
+        seen_parts = set()
+        for path in _part_paths(archive):
+            with archive.open(path) as stream:
+                if path == DOCUMENT_PART:
+                    yield from _iter_part(stream)
+                    continue
+                # First-page, even and default headers often repeat each other
+                part = tuple(_iter_part(stream))
+            if part not in seen_parts:
+                seen_parts.add(part)
+                yield from part
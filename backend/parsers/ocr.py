@@ -0,0 +1,134 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytesseract
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+# LSTM engine; a page is one column of text in variable sizes, which fits
+# most resume layouts better than full automatic segmentation
+PAGE_TESSERACT_CONFIG = '--oem 1 --psm 4'
+# A band is a uniform block of text lines
+BAND_TESSERACT_CONFIG = '--oem 1 --psm 6'
+
+# Assumed page width when an image carries no DPI information (US letter)
+PAGE_WIDTH_INCHES = 8.5
+
+# EXIF orientations 5-8 store the image turned by 90 degrees
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class OCRPipeline:
+    def __init__(self, target_dpi=None, binarize=None, tile=None, band_height=None, max_workers=None):
+        self.target_dpi = target_dpi or int(os.environ.get('OCR_TARGET_DPI', 300))
+        self.binarize = binarize if binarize is not None else os.environ.get('OCR_BINARIZE', '1') != '0'
+        self.tile = tile if tile is not None else os.environ.get('OCR_TILE', '1') != '0'
+        # Roughly a third of a page at the target resolution
+        self.band_height = band_height or int(os.environ.get('OCR_BAND_HEIGHT', self.target_dpi * 3))
+        self.max_workers = max_workers or int(os.environ.get('OCR_WORKERS', os.cpu_count() or 1))
+
+    def image_to_string(self, image):
+        # Returns the recognized text and the time spent in each stage (ms)
+        timings = {}
+        total_start = time.perf_counter()
+
+        image = self.preprocess(image, timings)
+
+        start = time.perf_counter()
+        bands = self.split_bands(image) if self.tile else [image]
+        timings['split'] = _elapsed_ms(start)
+        timings['bands'] = len(bands)
+
+        start = time.perf_counter()
+        if len(bands) == 1:
+            text = pytesseract.image_to_string(bands[0], config=PAGE_TESSERACT_CONFIG)
+        else:
+            # tesseract runs as a subprocess, so threads are enough to keep
+            # every core busy; map() returns the bands in page order
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(bands))) as executor:
+                texts = executor.map(
+                    lambda band: pytesseract.image_to_string(band, config=BAND_TESSERACT_CONFIG),
+                    bands
+                )
+                text = '\n'.join(band_text.strip('\n') for band_text in texts)
+        timings['ocr'] = _elapsed_ms(start)
+
+        timings['total'] = _elapsed_ms(total_start)
+        return text, timings
+
+    def preprocess(self, image, timings):
+        # Sizes are worked out for the upright page: phone photos are often
+        # stored sideways with an EXIF orientation saying how to turn them
+        rotated = image.getexif().get(EXIF_ORIENTATION, 1) in ROTATED_ORIENTATIONS
+        width, height = (image.height, image.width) if rotated else image.size
+        dpi = self._source_dpi(image, width)
+        scale = min(1.0, self.target_dpi / dpi)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+        start = time.perf_counter()
+        if image.format == 'JPEG' and scale < 1.0:
+            # Let libjpeg decode straight to grayscale at a reduced scale;
+            # draft works on the image as stored, before it is turned upright
+            image.draft('L', (size[1], size[0]) if rotated else size)
+        image = ImageOps.exif_transpose(image).convert('L')
+        timings['grayscale'] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        if image.size != size and scale < 1.0:
+            image = image.resize(size, Image.LANCZOS)
+        timings['downscale'] = _elapsed_ms(start)
+
+        if self.binarize:
+            start = time.perf_counter()
+            image = self._adaptive_threshold(image)
+            timings['binarize'] = _elapsed_ms(start)
+
+        return image
+
+    def split_bands(self, image):
+        # Cuts the page into horizontal bands, choosing each cut at the row
+        # with the least ink near the target height so text lines stay whole
+        height = image.height
+        if height <= self.band_height * 1.5:
+            return [image]
+
+        # Averaged in float mode: an 8-bit average rounds a row holding a few
+        # ink pixels (a dot, a thin rule) down to 0 and reads it as blank
+        inverted = ImageOps.invert(image)
+        row_ink = list(inverted.convert('F').resize((1, height), Image.BOX).getdata())
+        window = self.band_height // 5
+
+        cuts = [0]
+        while height - cuts[-1] > self.band_height * 1.5:
+            target = cuts[-1] + self.band_height
+            low, high = target - window, min(height - 1, target + window)
+            cuts.append(min(range(low, high), key=lambda row: (row_ink[row], abs(row - target))))
+        cuts.append(height)
+
+        bands = []
+        for top, bottom in zip(cuts, cuts[1:]):
+            # Skip blank bands instead of paying for a tesseract run
+            if inverted.crop((0, top, image.width, bottom)).getbbox() is not None:
+                bands.append(image.crop((0, top, image.width, bottom)))
+        return bands or [image]
+
+    def _source_dpi(self, image, width):
+        # Phone cameras often claim 72 DPI, so the stored value is only
+        # trusted when it implies a plausible page width
+        dpi = image.info.get('dpi')
+        if dpi and dpi[0] and 5 <= width / float(dpi[0]) <= 14:
+            return float(dpi[0])
+        return width / PAGE_WIDTH_INCHES
+
+    def _adaptive_threshold(self, image, offset=12):
+        # A pixel is ink when it is darker than its neighbourhood mean by more
+        # than offset, which copes with shadows and uneven phone lighting
+        radius = max(5, self.target_dpi // 20)
+        local_mean = image.filter(ImageFilter.BoxBlur(radius))
+        darkness = ImageChops.subtract(local_mean, image)
+        return darkness.point([0 if value > offset else 255 for value in range(256)])
@@ -1,72 +1,279 @@
 import os
-import docx
-from pdfminer.high_level import extract_text as pdf_extract_text
-import re
-import pytesseract
-from PIL import Image
+import time
 import io
+from functools import lru_cache
+from ..utils.text_profile import TextProfile, SECTION_NAMES
+
+PDF_BACKENDS = ('auto', 'pymupdf', 'pdfminer')
+DOCX_BACKENDS = ('auto', 'stream', 'python-docx')
+
+# File extension -> parser method. Each format's libraries (python-docx,
+# PyMuPDF/pdfminer, PIL/pytesseract) are imported by its parser on first use,
+# so importing this module, or a worker that never sees a format, pays nothing
+# for them.
+FORMAT_PARSERS = {
+    '.pdf': 'parse_pdf',
+    '.docx': 'parse_docx',
+    '.jpg': 'parse_image',
+    '.jpeg': 'parse_image',
+    '.png': 'parse_image'
+}
+
+@lru_cache(maxsize=None)
+def pdf_laparams():
+    # Layout analysis tuned for resumes: single-column reading order, no
+    # vertical text detection and no analysis of text inside figures
+    from pdfminer.layout import LAParams
+    return LAParams(
+        line_margin=0.3,
+        char_margin=2.0,
+        word_margin=0.1,
+        boxes_flow=0.5,
+        detect_vertical=False,
+        all_texts=False
+    )
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, max_pages=None, max_chars=None, pdf_backend=None, docx_backend=None):
+        # Only the first pages of a PDF matter for scoring, so extraction
+        # stops at whichever page or character budget runs out first
+        self.max_pages = max_pages or int(os.environ.get('PDF_MAX_PAGES', 10))
+        self.max_chars = max_chars or int(os.environ.get('PDF_MAX_CHARS', 50000))
+        self.pdf_backend = pdf_backend or os.environ.get('PDF_BACKEND', 'auto')
+        if self.pdf_backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {self.pdf_backend}")
+        self.docx_backend = docx_backend or os.environ.get('DOCX_BACKEND', 'auto')
+        if self.docx_backend not in DOCX_BACKENDS:
+            raise ValueError(f"Unknown DOCX backend: {self.docx_backend}")
+        self.page_count = 0
+        self.truncated = False
         self.text = ""
+        self.profile = None
         self.sections = {
             'contact': '',
             'education': '',
             'experience': '',
             'skills': ''
         }
+        # Milliseconds spent in each extraction stage of the last parse
+        self.timings = {}
 
     def parse_docx(self, file_path):
-        doc = docx.Document(file_path)
-        self.text = "\n".join([para.text for para in doc.paragraphs])
+        # The streaming extractor is the default; python-docx stays as the
+        # fallback for files it cannot read
+        start = time.perf_counter()
+        source = self._open_source(file_path)
+        text = None
+        if self.docx_backend in ('auto', 'stream'):
+            try:
+                text = self._stream_docx_text(source)
+            except Exception as e:
+                if self.docx_backend == 'stream':
+                    raise
+                print(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+                if hasattr(source, 'seek'):
+                    source.seek(0)
+        if text is None:
+            import docx
+            doc = docx.Document(source)
+            text = self._join_within_budget(para.text for para in doc.paragraphs)
+        self.text = text
+        self.timings['docx'] = round((time.perf_counter() - start) * 1000, 2)
         return self.text
 
+    def _stream_docx_text(self, source):
+        from .docx_text import iter_docx_paragraphs
+        return self._join_within_budget(iter_docx_paragraphs(source))
+
+    def _join_within_budget(self, paragraphs):
+        # Joins paragraphs with newlines, stopping once the text would grow
+        # past max_chars; chars is the joined length so far plus the newline
+        # the next paragraph needs
+        self.truncated = False
+        lines = []
+        chars = 0
+        for paragraph in paragraphs:
+            if chars + len(paragraph) > self.max_chars:
+                self.truncated = True
+                if chars < self.max_chars:
+                    lines.append(paragraph[:self.max_chars - chars])
+                break
+            chars += len(paragraph) + 1
+            lines.append(paragraph)
+        return "\n".join(lines)
+
     def parse_pdf(self, file_path):
         try:
-            self.text = pdf_extract_text(file_path)
+            start = time.perf_counter()
+            # Each page is profiled as it arrives, so extract_sections has
+            # nothing left to scan for PDFs
+            profile = TextProfile()
+            text = io.StringIO()
+            for index, page_text in enumerate(self.iter_pdf_pages(file_path)):
+                if index:
+                    text.write('\n')
+                    profile.add('\n')
+                text.write(page_text)
+                profile.add(page_text)
+            self.text = text.getvalue()
+            self.profile = profile
+            self.timings['pdf'] = round((time.perf_counter() - start) * 1000, 2)
             return self.text
         except Exception as e:
             print(f"Error parsing PDF: {str(e)}")
             return ""
 
+    def iter_pdf_pages(self, file_path):
+        # Yields page texts in order until the page or character budget is
+        # spent. PyMuPDF is much faster than pdfminer and is preferred when
+        # installed; pdfminer remains the fallback.
+        if isinstance(file_path, (bytes, bytearray, memoryview)):
+            source = bytes(file_path)
+        elif isinstance(file_path, (str, os.PathLike)):
+            source = file_path
+        else:
+            source = file_path.read()
+
+        pages = None
+        if self.pdf_backend in ('auto', 'pymupdf'):
+            try:
+                pages = self._pymupdf_pages(source)
+            except Exception as e:
+                if self.pdf_backend == 'pymupdf':
+                    raise
+                if not isinstance(e, ImportError):
+                    print(f"PyMuPDF failed, falling back to pdfminer: {str(e)}")
+        if pages is None:
+            pages = self._pdfminer_pages(source)
+
+        self.page_count = 0
+        self.truncated = False
+        chars = 0
+        for page_text in pages:
+            self.page_count += 1
+            if chars + len(page_text) > self.max_chars:
+                self.truncated = True
+                if chars < self.max_chars:
+                    yield page_text[:self.max_chars - chars]
+                break
+            chars += len(page_text)
+            yield page_text
+            if self.page_count >= self.max_pages:
+                # Only report truncation when pages were actually skipped
+                self.truncated = next(pages, None) is not None
+                break
+        pages.close()
+
+    def _pymupdf_pages(self, source):
+        # Optional dependency; newer releases rename the fitz module
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+
+        if isinstance(source, bytes):
+            doc = pymupdf.open(stream=source, filetype='pdf')
+        else:
+            doc = pymupdf.open(source)
+
+        # Opening happens eagerly so a broken file can still fall back to pdfminer
+        def pages():
+            try:
+                for page in doc:
+                    yield page.get_text('text')
+            finally:
+                doc.close()
+
+        return pages()
+
+    def _pdfminer_pages(self, source):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        source = self._open_source(source)
+        # Read one page past the budget so truncation can be detected
+        for layout in extract_pages(source, laparams=pdf_laparams(), maxpages=self.max_pages + 1):
+            yield ''.join(
+                element.get_text() for element in layout if isinstance(element, LTTextContainer)
+            )
+
     def parse_image(self, file_path):
         try:
-            image = Image.open(file_path)
-            self.text = pytesseract.image_to_string(image)
+            from PIL import Image
+            from .ocr import OCRPipeline
+            image = Image.open(self._open_source(file_path))
+            self.text, timings = OCRPipeline().image_to_string(image)
+            # The band count is not a duration
+            timings.pop('bands', None)
+            self.timings.update((f'ocr_{name}', ms) for name, ms in timings.items())
             return self.text
         except Exception as e:
             raise Exception(f"Error extracting text from image: {str(e)}")
 
-    def extract_text(self, file_path):
-        _, file_extension = os.path.splitext(file_path)
+    def _open_source(self, source):
+        # Parsers accept a path or any binary file-like object; raw bytes are
+        # wrapped so uploads never have to be written to disk first
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return io.BytesIO(source)
+        return source
+
+    def extract_text(self, file_path, filename=None):
+        # In-memory sources carry no name, so the format comes from filename
+        if filename is None:
+            if not isinstance(file_path, (str, os.PathLike)):
+                raise ValueError("A filename is required to parse an in-memory resume")
+            filename = file_path
+        _, file_extension = os.path.splitext(filename)
         file_extension = file_extension.lower()
         
-        if file_extension in ['.jpg', '.jpeg', '.png']:
-            return self.parse_image(file_path)
-        elif file_extension == '.docx':
-            return self.parse_docx(file_path)
-        elif file_extension == '.pdf':
-            return self.parse_pdf(file_path)
-        else:
+        parser = FORMAT_PARSERS.get(file_extension)
+        if parser is None:
             raise ValueError("Unsupported file format")
+        self.profile = None
+        return getattr(self, parser)(file_path)
 
     def extract_sections(self):
-        sections_found = {
-            'contact': False,
-            'education': False,
-            'experience': False,
-            'skills': False
-        }
-        
         try:
-            # Check for each section using case-insensitive regex
-            sections_found['education'] = bool(re.search(r'(?i)education', self.text))
-            sections_found['experience'] = bool(re.search(r'(?i)(work experience|experience)', self.text))
-            sections_found['skills'] = bool(re.search(r'(?i)(skills|technical skills)', self.text))
-            sections_found['contact'] = bool(re.search(r'(?i)(email|phone|address)', self.text))
-            
-            return sections_found
+            if self.profile is None:
+                self.profile = TextProfile(self.text)
+            return dict(self.profile.sections)
             
         except Exception as e:
             print(f"Error extracting sections: {str(e)}")
-            return sections_found
+            return dict.fromkeys(SECTION_NAMES, False)
+
+def _source_size(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+def parse_resume(data, filename, expires_at=None):
+    # Module-level entry point so parsing can run in a process pool: takes the
+    # raw file bytes (or a binary file object) and returns everything the
+    # analyzers need, plus parse_stats describing the work done. A parse
+    # that only gets to start after expires_at (a time.time() value), e.g.
+    # one queued in a pool worker for a caller that gave up, returns at once.
+    if expires_at is not None and time.time() >= expires_at:
+        raise TimeoutError(f"Parsing {filename} did not start before its deadline")
+    size = _source_size(data)
+    parser = ResumeParser()
+    start = time.perf_counter()
+    text = parser.extract_text(data, filename=filename)
+    extract_ms = round((time.perf_counter() - start) * 1000, 2)
+    start = time.perf_counter()
+    sections = parser.extract_sections()
+    sections_ms = round((time.perf_counter() - start) * 1000, 2)
+    profile = parser.profile.to_dict() if parser.profile else None
+    return {
+        'text': text,
+        'sections': sections,
+        'profile': profile,
+        'parse_stats': {
+            'bytes': size,
+            'pages': parser.page_count,
+            'timings': {'extract_text': extract_ms, **parser.timings, 'extract_sections': sections_ms}
+        }
+    }
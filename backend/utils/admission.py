@@ -0,0 +1,139 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, work_class, reason, retry_after):
+        super().__init__(f"{work_class} capacity exhausted ({reason})")
+        self.work_class = work_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class WorkClass:
+    # Concurrency limit and bounded FIFO wait queue for one kind of work.
+    # The limit adapts to observed latency (AIMD): it grows by about one slot
+    # per limit's worth of runs that finish within target_latency, and shrinks
+    # by a tenth, at most once per target_latency, when runs take longer.
+    def __init__(self, name, limit, max_queue=16, target_latency=1.0, min_limit=1, max_limit=None):
+        self.name = name
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit or limit * 2
+        self.max_queue = max_queue
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters = deque()
+        self._condition = threading.Condition()
+        self._avg_latency = None
+        self._last_decrease = 0.0
+
+    def _capacity(self):
+        return max(self.min_limit, int(self.limit))
+
+    def _average_latency(self):
+        return self._avg_latency if self._avg_latency is not None else self.target_latency
+
+    def _expected_wait(self, position):
+        # Seconds until the waiter at this queue position gets a slot
+        return self._average_latency() * (position + 1) / self._capacity()
+
+    def _misses_deadline(self, position, deadline):
+        # Whether waiting for a slot and then running would end past deadline
+        finish = time.monotonic() + self._expected_wait(position) + self._average_latency()
+        return deadline is not None and finish > deadline
+
+    def _reject(self, reason, position):
+        self.rejected += 1
+        retry_after = max(1, math.ceil(self._expected_wait(position)))
+        return AdmissionRejected(self.name, reason, retry_after)
+
+    def acquire(self, deadline=None):
+        with self._condition:
+            if not self._waiters and self.in_flight < self._capacity():
+                self.in_flight += 1
+                self.admitted += 1
+                return
+
+            position = len(self._waiters)
+            if position >= self.max_queue:
+                raise self._reject('queue full', position)
+            # Refuse straight away rather than start work that would only
+            # finish after the caller's deadline
+            if self._misses_deadline(position, deadline):
+                raise self._reject('deadline', position)
+
+            waiter = object()
+            self._waiters.append(waiter)
+            try:
+                while self._waiters[0] is not waiter or self.in_flight >= self._capacity():
+                    # Latency estimates change while waiting; give up as soon
+                    # as the deadline is out of reach
+                    position = self._waiters.index(waiter)
+                    if self._misses_deadline(position, deadline):
+                        raise self._reject('deadline', position)
+                    self._condition.wait(None if deadline is None else deadline - time.monotonic())
+                self.in_flight += 1
+                self.admitted += 1
+            finally:
+                self._waiters.remove(waiter)
+                self._condition.notify_all()
+
+    def release(self, latency):
+        with self._condition:
+            self.in_flight -= 1
+            if self._avg_latency is None:
+                self._avg_latency = latency
+            else:
+                self._avg_latency = 0.8 * self._avg_latency + 0.2 * latency
+
+            now = time.monotonic()
+            if latency > self.target_latency:
+                if now - self._last_decrease >= self.target_latency:
+                    self.limit = max(self.min_limit, self.limit * 0.9)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            return {
+                'limit': self._capacity(),
+                'in_flight': self.in_flight,
+                'queued': len(self._waiters),
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'avg_latency_ms': round(self._avg_latency * 1000, 2) if self._avg_latency is not None else None
+            }
+
+
+class AdmissionController:
+    # Per-process gate in front of expensive work: each class of work has its
+    # own limit and queue, so slow OCR cannot starve cheap requests
+    def __init__(self, classes, enabled=True):
+        self.classes = {work_class.name: work_class for work_class in classes}
+        self.enabled = enabled
+
+    @contextmanager
+    def admit(self, name, deadline=None):
+        # Raises AdmissionRejected when the work cannot start in time
+        if not self.enabled:
+            yield
+            return
+
+        work_class = self.classes[name]
+        work_class.acquire(deadline)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            work_class.release(time.monotonic() - start)
+
+    def stats(self):
+        return {name: work_class.stats() for name, work_class in self.classes.items()}
@@ -0,0 +1,53 @@
+import threading
+
+from .text_profile import TextProfile
+
+_MISSING = object()
+
+
+class AnalysisContext:
+    # Per-request state shared by every analyzer. Derived views of the text
+    # (normalized text, text profile, term counts) are computed lazily, at
+    # most once, and safely when stages run on several threads.
+    def __init__(self, text, sections=None, role=None, profile=None, matcher=None):
+        self.text = text
+        # Optional SkillMatcher covering the terms of every analyzer, so one
+        # scan of the text serves all of them
+        self.matcher = matcher
+        self.sections = sections if sections is not None else {}
+        self.role = role
+        self.timings = {}
+        self._values = {}
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        if profile is not None:
+            self._values['profile'] = profile
+
+    def memo(self, key, compute):
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            value = self._values.get(key, _MISSING)
+            if value is _MISSING:
+                value = compute()
+                self._values[key] = value
+            return value
+
+    @property
+    def normalized_text(self):
+        return self.memo('normalized_text', self.text.lower)
+
+    @property
+    def profile(self):
+        return self.memo('profile', lambda: TextProfile(self.text))
+
+    def term_counts(self, matcher):
+        # Whole-word counts of every term known to a SkillMatcher; the shared
+        # matcher is used instead when the context has one
+        if self.matcher is not None:
+            matcher = self.matcher
+        return self.memo(('term_counts', id(matcher)), lambda: matcher.count(self.normalized_text))
@@ -0,0 +1,86 @@
+import gc
+import resource
+import sys
+import threading
+import time
+
+
+def current_rss_mb():
+    # Resident set size of this process; /proc is exact on Linux, getrusage
+    # reports the peak as a fallback elsewhere
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class AnalyzerRegistry:
+    def __init__(self):
+        self._factories = {}
+        self._lazy = set()
+        self._instances = {}
+        # Reentrant so a factory may build the analyzers it depends on
+        self._lock = threading.RLock()
+        self.load_times = {}
+        self.rss_before_mb = None
+        self.rss_after_mb = None
+
+    def register(self, name, factory, preload=True):
+        # preload=False leaves an analyzer out of load_all(), for those that
+        # only rarely used endpoints need
+        self._factories[name] = factory
+        if not preload:
+            self._lazy.add(name)
+
+    def get(self, name):
+        # Fast path without the lock once an analyzer has been built
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                start = time.perf_counter()
+                instance = self._factories[name]()
+                self.load_times[name] = (time.perf_counter() - start) * 1000
+                self._instances[name] = instance
+            return instance
+
+    def load_all(self):
+        if self.rss_before_mb is None:
+            self.rss_before_mb = current_rss_mb()
+
+        for name in self._factories:
+            if name not in self._lazy:
+                self.get(name)
+
+        self.rss_after_mb = current_rss_mb()
+
+        # Move everything allocated so far into the permanent generation so
+        # that the garbage collector does not touch (and therefore copy) these
+        # pages in forked gunicorn workers
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+        return self.stats()
+
+    def stats(self):
+        return {
+            'loaded': sorted(self._instances),
+            'load_times_ms': {name: round(ms, 2) for name, ms in self.load_times.items()},
+            'total_load_time_ms': round(sum(self.load_times.values()), 2),
+            'rss_before_mb': round(self.rss_before_mb, 1) if self.rss_before_mb is not None else None,
+            'rss_after_mb': round(self.rss_after_mb, 1) if self.rss_after_mb is not None else None
+        }
+
+    def report(self):
+        stats = self.stats()
+        timings = ', '.join(f"{name}={ms:.0f}ms" for name, ms in stats['load_times_ms'].items())
+        print(f"Analyzers loaded in {stats['total_load_time_ms']:.0f}ms ({timings}); "
+              f"RSS {stats['rss_before_mb']}MB -> {stats['rss_after_mb']}MB")
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    years_experience REAL,
+    sections TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+-- Inverted index: rows are clustered by skill, so a skill's posting list is
+-- one contiguous range of the table
+CREATE TABLE IF NOT EXISTS skill_postings (
+    skill TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (skill, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skill_postings_candidate ON skill_postings (candidate_id);
+-- Role scores computed on insert, so top-k for a role is a range scan
+CREATE TABLE IF NOT EXISTS role_scores (
+    role TEXT NOT NULL,
+    score REAL NOT NULL,
+    weighted_count INTEGER NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    PRIMARY KEY (role, score, weighted_count, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS role_scores_candidate ON role_scores (candidate_id);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Occurrences beyond this add nothing to a candidate's score
+MAX_COUNTED_OCCURRENCES = 5
+
+
+class CandidateIndex:
+    # Persistent store of analyzed resumes (skill counts, section flags and
+    # years of experience, never the resume text) for top-k candidate search.
+    # role_terms maps each role to its keywords.
+    def __init__(self, path, role_terms=None):
+        self.path = path
+        self.role_terms = {
+            role: sorted({term.lower() for term in terms}) for role, terms in (role_terms or {}).items()
+        }
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Set up on a connection of its own: the index is created at import
+        # time, possibly in a gunicorn master that forks the workers
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self._sync_role_scores(conn)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _connection(self):
+        # sqlite connections cannot be shared between threads, nor used in a
+        # process forked after they were opened: one per thread and process
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            self._local.conn = self._connect()
+            self._local.pid = pid
+        return self._local.conn
+
+    def _sync_role_scores(self, conn):
+        # Stored role scores are only valid for the role definitions they were
+        # computed with; recompute them from the postings when those change
+        signature = hashlib.sha256(json.dumps(self.role_terms, sort_keys=True).encode()).hexdigest()
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'role_terms'").fetchone()
+        if row is not None and row[0] == signature:
+            return
+
+        with conn:
+            conn.execute("DELETE FROM role_scores")
+            for role, terms in self.role_terms.items():
+                placeholders = ', '.join('?' for _ in terms)
+                conn.execute(
+                    "INSERT INTO role_scores (role, score, weighted_count, candidate_id) "
+                    f"SELECT ?, COUNT(*) * 100.0 / ?, SUM(MIN(count, {MAX_COUNTED_OCCURRENCES})), candidate_id "
+                    f"FROM skill_postings WHERE skill IN ({placeholders}) GROUP BY candidate_id",
+                    [role, len(terms)] + terms
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('role_terms', ?)", (signature,)
+            )
+
+    def _role_score_rows(self, candidate_id, skill_counts):
+        rows = []
+        for role, terms in self.role_terms.items():
+            hits = [min(skill_counts[term], MAX_COUNTED_OCCURRENCES)
+                    for term in terms if skill_counts.get(term, 0) > 0]
+            if hits:
+                rows.append((role, len(hits) * 100.0 / len(terms), sum(hits), candidate_id))
+        return rows
+
+    def add(self, content_hash, filename, skill_counts, sections, years_experience):
+        # Inserts a candidate or replaces the stored data of the same file
+        conn = self._connection()
+        with conn:
+            candidate_id = conn.execute(
+                "INSERT INTO candidates (content_hash, filename, years_experience, sections, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (content_hash) DO UPDATE SET filename = excluded.filename, "
+                "years_experience = excluded.years_experience, sections = excluded.sections, "
+                "indexed_at = excluded.indexed_at "
+                "RETURNING id",
+                (content_hash, filename, years_experience, json.dumps(sections), time.time())
+            ).fetchone()[0]
+            conn.execute("DELETE FROM skill_postings WHERE candidate_id = ?", (candidate_id,))
+            conn.execute("DELETE FROM role_scores WHERE candidate_id = ?", (candidate_id,))
+            conn.executemany(
+                "INSERT INTO skill_postings (skill, candidate_id, count) VALUES (?, ?, ?)",
+                [(skill, candidate_id, count) for skill, count in skill_counts.items() if count > 0]
+            )
+            conn.executemany(
+                "INSERT INTO role_scores (role, score, weighted_count, candidate_id) VALUES (?, ?, ?, ?)",
+                self._role_score_rows(candidate_id, skill_counts)
+            )
+        return candidate_id
+
+    def remove(self, content_hash):
+        conn = self._connection()
+        with conn:
+            row = conn.execute(
+                "SELECT id FROM candidates WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM skill_postings WHERE candidate_id = ?", (row[0],))
+            conn.execute("DELETE FROM role_scores WHERE candidate_id = ?", (row[0],))
+            conn.execute("DELETE FROM candidates WHERE id = ?", (row[0],))
+        return True
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def search_role(self, role, k=50, min_years=None):
+        # Walks the role's precomputed scores from the top and stops after k
+        if role not in self.role_terms or k <= 0:
+            return []
+
+        query = (
+            "SELECT r.candidate_id, r.score FROM role_scores r "
+            "JOIN candidates c ON c.id = r.candidate_id WHERE r.role = ? "
+        )
+        params = [role]
+        if min_years is not None:
+            query += "AND c.years_experience >= ? "
+            params.append(min_years)
+        query += "ORDER BY r.score DESC, r.weighted_count DESC LIMIT ?"
+        params.append(k)
+
+        ranked = self._connection().execute(query, params).fetchall()
+        return self._results(ranked, self.role_terms[role])
+
+    def search(self, skill_weights, k=50, min_years=None):
+        # Top-k candidates by the weighted share of the queried skills they
+        # have, ties broken by how often they mention them. Only the posting
+        # lists of the queried skills are read.
+        skill_weights = {skill.lower(): float(weight) for skill, weight in skill_weights.items()}
+        if not skill_weights or k <= 0:
+            return []
+        total_weight = sum(skill_weights.values())
+
+        values = ', '.join('(?, ?)' for _ in skill_weights)
+        params = [item for pair in skill_weights.items() for item in pair]
+        query = (
+            f"WITH query (skill, weight) AS (VALUES {values}) "
+            "SELECT p.candidate_id, SUM(q.weight) * 100.0 / ? AS score, "
+            f"SUM(q.weight * MIN(p.count, {MAX_COUNTED_OCCURRENCES})) AS weighted_count "
+            "FROM query q JOIN skill_postings p ON p.skill = q.skill "
+        )
+        params.append(total_weight)
+        if min_years is not None:
+            query += "JOIN candidates c ON c.id = p.candidate_id WHERE c.years_experience >= ? "
+            params.append(min_years)
+        query += "GROUP BY p.candidate_id ORDER BY score DESC, weighted_count DESC LIMIT ?"
+        params.append(k)
+
+        ranked = [row[:2] for row in self._connection().execute(query, params)]
+        return self._results(ranked, list(skill_weights))
+
+    def _results(self, ranked, skills):
+        # Details and matched skill counts for (candidate id, score) rows
+        if not ranked:
+            return []
+
+        conn = self._connection()
+        ids = [row[0] for row in ranked]
+        placeholders = ', '.join('?' for _ in ids)
+        details = {
+            row[0]: row[1:] for row in conn.execute(
+                "SELECT id, content_hash, filename, years_experience, sections "
+                f"FROM candidates WHERE id IN ({placeholders})", ids
+            )
+        }
+        matched = {}
+        skill_placeholders = ', '.join('?' for _ in skills)
+        for candidate_id, skill, count in conn.execute(
+            "SELECT candidate_id, skill, count FROM skill_postings "
+            f"WHERE candidate_id IN ({placeholders}) AND skill IN ({skill_placeholders})",
+            ids + list(skills)
+        ):
+            matched.setdefault(candidate_id, {})[skill] = count
+
+        results = []
+        for candidate_id, score in ranked:
+            content_hash, filename, years_experience, sections = details[candidate_id]
+            results.append({
+                'candidate_id': content_hash,
+                'filename': filename,
+                'score': round(score, 2),
+                'matched_skills': matched.get(candidate_id, {}),
+                'years_experience': years_experience,
+                'sections_found': json.loads(sections)
+            })
+        return results
@@ -0,0 +1,163 @@
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+# Before Python 3.11 the futures TimeoutError is not the builtin one; a job
+# can time out waiting on a future or in code that raises the builtin
+TIMEOUT_ERRORS = (TimeoutError, FutureTimeoutError)
+
+
+class QueueFullError(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Job queue is full")
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, meta=None):
+        self.id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.meta = meta or {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.deadline = None
+
+    def to_dict(self):
+        job = {
+            'job_id': self.id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+        job.update(self.meta)
+        if self.status == 'done':
+            job['result'] = self.result
+        elif self.error is not None:
+            job['error'] = self.error
+        return job
+
+    def to_state(self):
+        # Everything but the deadline, which is only meaningful in the process
+        # running the job
+        state = dict(vars(self))
+        del state['deadline']
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        job = cls.__new__(cls)
+        job.__dict__.update(state)
+        job.deadline = None
+        return job
+
+
+class JobQueue:
+    # Bounded local job runner: at most max_pending jobs are queued or running
+    # at once, further submissions are refused so callers can back off. Jobs
+    # receive a monotonic deadline and are marked as timed out when they
+    # exceed it, including time spent waiting in the queue. Jobs run in the
+    # process that accepted them; with a store (a SqliteCache shared by every
+    # worker process) their state is also written there, so a poll answered
+    # by any worker finds them.
+    def __init__(self, max_workers=2, max_pending=20, job_timeout=120, result_ttl=600, store=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.job_timeout = job_timeout
+        self.result_ttl = result_ttl
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._active = 0
+        self._avg_duration = None
+
+    def submit(self, fn, *args, meta=None):
+        with self._lock:
+            self._purge_finished()
+            if self._active >= self.max_pending:
+                raise QueueFullError(self._estimate_retry_after())
+            job = Job(meta)
+            job.deadline = time.monotonic() + self.job_timeout
+            self._jobs[job.id] = job
+            self._active += 1
+
+        self._save(job)
+        self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None or self.store is None:
+            return job
+        try:
+            state = self.store.get(job_id)
+        except sqlite3.Error as e:
+            print(f"Job store read error: {str(e)}")
+            return None
+        return Job.from_state(state) if state is not None else None
+
+    def _save(self, job):
+        if self.store is None:
+            return
+        try:
+            self.store.set(job.id, job.to_state())
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Job store write error for {job.id}: {str(e)}")
+
+    def depth(self):
+        return self._active
+
+    def _run(self, job, fn, args):
+        started = time.monotonic()
+        try:
+            if started >= job.deadline:
+                raise TimeoutError()
+            job.status = 'running'
+            job.started_at = time.time()
+            self._save(job)
+            job.result = fn(*args, deadline=job.deadline)
+            job.status = 'done'
+        except TIMEOUT_ERRORS:
+            job.status = 'timeout'
+            job.error = f'Job exceeded the {self.job_timeout}s time limit'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self._save(job)
+            duration = time.monotonic() - started
+            with self._lock:
+                self._active -= 1
+                if self._avg_duration is None:
+                    self._avg_duration = duration
+                else:
+                    self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+    def _estimate_retry_after(self):
+        # Rough time until a slot frees up, from the recent average job length
+        average = self._avg_duration if self._avg_duration is not None else 5.0
+        return max(1, math.ceil(average * self._active / self.max_workers))
+
+    def _purge_finished(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self.store is not None:
+            try:
+                self.store.purge_expired()
+            except sqlite3.Error as e:
+                print(f"Job store purge error: {str(e)}")
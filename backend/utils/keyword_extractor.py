@@ -1,10 +1,10 @@
-import spacy
 from collections import defaultdict
-import re
+from .skill_matcher import SkillMatcher
+from .skill_vocabulary import SKILL_VOCABULARY, popcount
 
 class KeywordExtractor:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, skill_vocabulary=None):
+        self.skill_vocabulary = skill_vocabulary if skill_vocabulary is not None else SKILL_VOCABULARY
         
         # Expanded skill patterns by category
         self.skill_patterns = {
@@ -39,22 +39,31 @@ class KeywordExtractor:
             }
         }
 
-    def extract_keywords(self, text):
-        text = text.lower()
+        # Compiled once so that every skill is found in a single scan
+        self.skill_matcher = SkillMatcher(
+            skill for skills in self.skill_patterns.values() for skill in skills
+        )
+        # Interned so the skills found in a resume can be masked against any
+        # other analyzer's skill sets
+        self.skill_vocabulary.compile(self.skill_matcher.terms)
+
+    def extract_keywords(self, text, context=None):
+        # The context supplies the lowercased text and term counts when other
+        # analyzers already computed them for this request
+        text = context.normalized_text if context is not None else text.lower()
         keywords_by_category = defaultdict(list)
         
-        # Process text with spaCy
-        doc = self.nlp(text)
+        # Count whole word matches of every skill in one pass
+        if context is not None:
+            skill_counts = context.term_counts(self.skill_matcher)
+        else:
+            skill_counts = self.skill_matcher.count(text)
         
         # Extract keywords by category
         for category, skills in self.skill_patterns.items():
             for skill in skills:
-                # Use regex to find whole word matches only
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                matches = re.findall(pattern, text)
-                if matches:
-                    # Count occurrences
-                    count = len(matches)
+                count = skill_counts.get(skill, 0)
+                if count:
                     keywords_by_category[category].append({
                         'keyword': skill,
                         'count': count,
@@ -77,11 +86,10 @@ class KeywordExtractor:
             return "Low"
 
     def calculate_relevance(self, keywords, job_requirements):
-        # Flatten all found keywords
-        all_keywords = set()
-        for category in keywords.values():
-            for item in category:
-                all_keywords.add(item['keyword'])
+        # Mask of all found keywords, matched against the requirements' mask.
+        # Requirements come from the caller, so they are masked rather than
+        # compiled; one the vocabulary does not know cannot have been found.
+        found = self.skill_vocabulary.mask(item['keyword'] for category in keywords.values() for item in category)
         
-        matches = set(job_requirements).intersection(all_keywords)
-        return len(matches) / len(job_requirements) if job_requirements else 0
+        matches = popcount(self.skill_vocabulary.mask(job_requirements) & found)
+        return matches / len(job_requirements) if job_requirements else 0
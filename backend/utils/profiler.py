@@ -0,0 +1,161 @@
+import cProfile
+import hmac
+import io
+import itertools
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+PROFILE_MODES = ('cprofile', 'sampler')
+
+_state = threading.local()
+
+
+def is_profiling():
+    # True on a thread whose work is being profiled; callers use it to keep
+    # that work on the profiled thread instead of handing it to a pool
+    return getattr(_state, 'active', False)
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+
+class StackSampler:
+    # Statistical profiler: a background thread records the stack of one
+    # target thread every interval, as flamegraph collapsed stacks
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profile:
+    def __init__(self, mode, meta):
+        self.id = uuid.uuid4().hex[:12]
+        self.mode = mode
+        self.meta = meta
+        self.created_at = time.time()
+        self.duration_ms = None
+        self.error = None
+        # marshal-encoded pstats data (cprofile) or collapsed stacks (sampler)
+        self.pstats_data = None
+        self.collapsed_stacks = None
+
+    def formats(self):
+        return ['pstats', 'text'] if self.mode == 'cprofile' else ['collapsed']
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'mode': self.mode,
+            'created_at': self.created_at,
+            'duration_ms': self.duration_ms,
+            'error': self.error,
+            'formats': self.formats(),
+            **self.meta
+        }
+
+    def text_report(self, limit=60):
+        stats = pstats.Stats()
+        stats.stats = marshal.loads(self.pstats_data)
+        stats.get_top_level_stats()
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+
+class RequestProfiler:
+    # Opt-in profiling of live requests. Requests are profiled when they
+    # present the token, or one in every sample_rate requests when sampling is
+    # on. The last buffer_size profiles are kept in memory.
+    def __init__(self, token=None, sample_rate=0, mode='cprofile', buffer_size=20, sample_interval=0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.token = token
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self._profiles = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._requests = itertools.count(1)
+
+    def authorized(self, supplied):
+        return bool(self.token) and bool(supplied) and hmac.compare_digest(str(supplied), self.token)
+
+    def should_sample(self):
+        return self.sample_rate > 0 and next(self._requests) % self.sample_rate == 0
+
+    def run(self, fn, mode=None, meta=None):
+        # Calls fn() under the profiler; returns (result, profile). The
+        # profile is stored even when fn raises.
+        profile = Profile(mode or self.mode, meta or {})
+        start = time.perf_counter()
+        _state.active = True
+        try:
+            if profile.mode == 'cprofile':
+                profiler = cProfile.Profile()
+                try:
+                    result = profiler.runcall(fn)
+                finally:
+                    profiler.create_stats()
+                    profile.pstats_data = marshal.dumps(profiler.stats)
+            else:
+                sampler = StackSampler(threading.get_ident(), self.sample_interval)
+                sampler.start()
+                try:
+                    result = fn()
+                finally:
+                    sampler.stop()
+                    profile.collapsed_stacks = sampler.collapsed()
+            return result, profile
+        except Exception as e:
+            profile.error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            _state.active = False
+            profile.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            with self._lock:
+                self._profiles.append(profile)
+
+    def list(self):
+        with self._lock:
+            return [profile.to_dict() for profile in reversed(self._profiles)]
+
+    def get(self, profile_id):
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
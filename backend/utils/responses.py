@@ -0,0 +1,143 @@
+import gzip
+import json
+
+from flask import Response
+
+# Optional fast paths: orjson for serialization, brotli and zstandard for
+# compression. Whatever is missing falls back to the standard library.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Mid-range levels: close to the best ratio for JSON at a fraction of the time
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+COMPRESSORS = {'gzip': lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+if brotli is not None:
+    COMPRESSORS['br'] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+if zstandard is not None:
+    COMPRESSORS['zstd'] = lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+# Preferred first when the client accepts several equally
+ENCODING_PREFERENCE = ('zstd', 'br', 'gzip')
+
+COMPRESSIBLE_TYPES = {'application/json', 'application/x-ndjson', 'text/plain', 'text/html', 'text/css',
+                      'application/javascript', 'text/javascript'}
+
+
+def _default(value):
+    # numpy scalars and arrays, and sets
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(value):
+    return json.dumps(value, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def _orjson_dumps(value):
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+JSON_BACKENDS = {'json': _stdlib_dumps}
+if orjson is not None:
+    JSON_BACKENDS['orjson'] = _orjson_dumps
+
+
+def parse_accept_encoding(header):
+    # {coding: q} from an Accept-Encoding header
+    codings = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def parse_fields(value, allowed):
+    # Field list from a comma separated ?fields= value, in the order given;
+    # None when no projection was asked for
+    if not value:
+        return None
+    fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields or None
+
+
+def project(result, fields):
+    return result if fields is None else {field: result[field] for field in fields}
+
+
+class ResponseEncoder:
+    # Serializes JSON responses with the fastest available backend and
+    # compresses responses of at least min_size bytes with the best encoding
+    # the client accepts
+    def __init__(self, json_backend='auto', min_size=1024, encodings=ENCODING_PREFERENCE):
+        if json_backend == 'auto':
+            json_backend = 'orjson' if 'orjson' in JSON_BACKENDS else 'json'
+        if json_backend not in JSON_BACKENDS:
+            raise ValueError(f"Unavailable JSON backend: {json_backend}")
+        self.json_backend = json_backend
+        self.dumps = JSON_BACKENDS[json_backend]
+        self.min_size = min_size
+        self.encodings = [encoding for encoding in encodings if encoding in COMPRESSORS]
+
+    def json_response(self, value, status=200):
+        return Response(self.dumps(value), status=status, mimetype='application/json')
+
+    def negotiate(self, accept_encoding):
+        codings = parse_accept_encoding(accept_encoding)
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = codings.get(encoding, codings.get('*', 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def compress_response(self, response, accept_encoding):
+        # Compresses a buffered response in place; streamed and file
+        # responses are left alone, and so are responses with an ETag, which
+        # names one representation (static assets choose their own)
+        if (not self.encodings or response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers or 'ETag' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate(accept_encoding)
+        if encoding is None:
+            return response
+        compressed = COMPRESSORS[encoding](data)
+        if len(compressed) < len(data):
+            response.set_data(compressed)
+            response.headers['Content-Encoding'] = encoding
+        return response
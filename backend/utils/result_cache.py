@@ -0,0 +1,176 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    def __init__(self, maxsize=256, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SqliteCache:
+    def __init__(self, path, table, ttl=3600):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Set up on a connection of its own: the cache is usually created at
+        # import time, possibly in a gunicorn master that forks the workers
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(f"DELETE FROM {table} WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _connection(self):
+        # sqlite connections cannot be shared between threads, nor used in a
+        # process forked after they were opened: one per thread and process
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            self._local.conn = self._connect()
+            self._local.pid = pid
+        return self._local.conn
+
+    def get(self, key, default=None):
+        row = self._connection().execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        conn = self._connection()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + self.ttl)
+        )
+        conn.commit()
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute(f"DELETE FROM {self.table}")
+        conn.commit()
+
+    def purge_expired(self):
+        conn = self._connection()
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+        conn.commit()
+
+
+class TieredCache:
+    # In-memory LRU in front of an optional sqlite file that survives restarts
+    def __init__(self, name, maxsize=256, ttl=3600, disk_path=None):
+        self.name = name
+        self.memory = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk = None
+        if disk_path:
+            try:
+                self.disk = SqliteCache(disk_path, name, ttl=ttl)
+            except sqlite3.Error as e:
+                print(f"Warning: disk cache {disk_path} unavailable: {str(e)}")
+
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('memory_hits')
+            return value
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key, _MISSING)
+            except sqlite3.Error as e:
+                print(f"Disk cache read error: {str(e)}")
+                value = _MISSING
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                self._count('disk_hits')
+                return value
+
+        self._count('misses')
+        return None
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error as e:
+                print(f"Disk cache write error: {str(e)}")
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            try:
+                self.disk.clear()
+            except sqlite3.Error as e:
+                print(f"Disk cache clear error: {str(e)}")
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            'memory_entries': len(self.memory),
+            'disk_enabled': self.disk is not None
+        }
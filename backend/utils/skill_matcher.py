@@ -0,0 +1,55 @@
+import re
+from collections import Counter
+
+# Trie key marking the end of a term; single characters can never collide with it
+_END = ''
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+# Counts whole-word occurrences of many terms in one pass over the text. Terms
+# live in a character trie that is walked from every candidate start position
+# (found by a single compiled regex). A match may not touch a word character on
+# either side, which, unlike \b, also works for terms such as c++, c# and .net.
+class SkillMatcher:
+    def __init__(self, terms):
+        self._trie = {}
+        self.terms = set()
+
+        for term in terms:
+            term = term.lower()
+            if not term:
+                continue
+            node = self._trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[_END] = term
+            self.terms.add(term)
+
+        first_chars = ''.join(re.escape(char) for char in sorted(self._trie))
+        self._start_re = re.compile(r'(?<!\w)[' + first_chars + ']') if first_chars else None
+
+    def count(self, text):
+        # Expects text that is already lowercased
+        counts = Counter()
+        if self._start_re is None:
+            return counts
+
+        root = self._trie
+        length = len(text)
+
+        for match in self._start_re.finditer(text):
+            node = root
+            pos = match.start()
+            while pos < length:
+                node = node.get(text[pos])
+                if node is None:
+                    break
+                pos += 1
+                term = node.get(_END)
+                if term is not None and (pos == length or not _is_word_char(text[pos])):
+                    counts[term] += 1
+
+        return counts
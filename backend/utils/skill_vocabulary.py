@@ -0,0 +1,85 @@
+import threading
+
+# Popcount of a Python int; int.bit_count is only available from 3.10
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    def popcount(mask):
+        return bin(mask).count('1')
+
+# Static skill sets compiled with compile() are cached up to this many
+MAX_COMPILED_SETS = 4096
+
+
+class SkillVocabulary:
+    # Interns skill strings to small integer ids, so every skill set an
+    # analyzer holds (role tiers, benchmarks, requirements) becomes one int
+    # bitmask. Matching and gap analysis are then AND / AND-NOT and popcount
+    # over those ints instead of building and comparing string sets. Ids are
+    # only ever added, so masks stay valid as more analyzers intern terms.
+    # Terms are compared exactly; callers normalize case where they need to.
+    def __init__(self, terms=()):
+        self.terms = []
+        self.ids = {}
+        self._compiled = {}
+        self._lock = threading.Lock()
+        for term in terms:
+            self.intern(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self.ids
+
+    def intern(self, term):
+        term_id = self.ids.get(term)
+        if term_id is None:
+            with self._lock:
+                term_id = self.ids.get(term)
+                if term_id is None:
+                    term_id = len(self.terms)
+                    self.terms.append(term)
+                    self.ids[term] = term_id
+        return term_id
+
+    def compile(self, terms):
+        # Mask of a fixed skill set, interning terms not seen before. Meant for
+        # an analyzer's own sets, so results are cached by set contents.
+        key = frozenset(terms)
+        mask = self._compiled.get(key)
+        if mask is None:
+            mask = 0
+            # Sorted so ids, and the order terms_of() reports them in, do not
+            # depend on set iteration order
+            for term in sorted(key):
+                mask |= 1 << self.intern(term)
+            if len(self._compiled) < MAX_COMPILED_SETS:
+                self._compiled[key] = mask
+        return mask
+
+    def mask(self, terms):
+        # Mask of the known terms among terms (e.g. the skills found in one
+        # resume, or requirements a caller passes in); unknown terms cannot
+        # match any compiled set and are skipped, so the vocabulary only grows
+        # with the analyzers' own sets
+        ids = self.ids
+        mask = 0
+        for term in terms:
+            term_id = ids.get(term)
+            if term_id is not None:
+                mask |= 1 << term_id
+        return mask
+
+    def terms_of(self, mask):
+        # Terms of a mask in id order
+        terms = []
+        while mask:
+            low = mask & -mask
+            terms.append(self.terms[low.bit_length() - 1])
+            mask ^= low
+        return terms
+
+
+# Shared by every analyzer in the process, so one id space covers all of them
+SKILL_VOCABULARY = SkillVocabulary()
@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import Response
+
+from .responses import ENCODING_PREFERENCE, brotli, parse_accept_encoding
+
+# Assets are compressed once at startup, so the slowest levels are affordable
+STATIC_COMPRESSORS = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+if brotli is not None:
+    STATIC_COMPRESSORS['br'] = lambda data: brotli.compress(data, quality=11)
+
+# Fingerprinted URLs never change content; everything else is revalidated
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+HTML_TYPES = {'text/html'}
+COMPRESSIBLE_TYPES = {'text/html', 'text/css', 'text/javascript', 'application/javascript', 'application/json',
+                      'image/svg+xml', 'text/plain'}
+
+# href="..." and src="..." attributes pointing at a relative or root path
+ASSET_REFERENCE = re.compile(r'''(\b(?:href|src)\s*=\s*["'])(/?)([^"'#?:]+)(["'])''')
+
+
+class StaticAsset:
+    def __init__(self, path, body, mimetype):
+        self.path = path
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        root, extension = os.path.splitext(path)
+        self.fingerprinted_path = f"{root}.{self.digest}{extension}"
+        # encoding -> (body, strong ETag); identity is the None entry
+        self.variants = {None: (body, f'"{self.digest}"')}
+        if mimetype in COMPRESSIBLE_TYPES:
+            for encoding, compress in STATIC_COMPRESSORS.items():
+                compressed = compress(body)
+                if len(compressed) < len(body):
+                    self.variants[encoding] = (compressed, f'"{self.digest}-{encoding}"')
+
+    def etags(self):
+        return {etag for _, etag in self.variants.values()}
+
+
+class StaticBundle:
+    # The frontend read into memory once: every file gets a content hash and
+    # precompressed variants, and is looked up by URL path in a dict instead
+    # of probing the filesystem per request. HTML pages are rewritten to
+    # reference the fingerprinted URLs of other assets, which can then be
+    # cached for good; the pages themselves are revalidated with their ETag.
+    def __init__(self, root, index='index.html'):
+        self.root = root
+        self.index = index
+        self.assets = {}
+        self.routes = {}
+        self.load()
+
+    def load(self):
+        assets = {}
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                full_path = os.path.join(directory, filename)
+                path = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                with open(full_path, 'rb') as f:
+                    assets[path] = (f.read(), mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+
+        # Pages come last so they can point at the other assets' fingerprints
+        built = {}
+        for path, (body, mimetype) in sorted(assets.items(), key=lambda item: item[1][1] in HTML_TYPES):
+            if mimetype in HTML_TYPES:
+                body = self._rewrite_references(path, body, built)
+            built[path] = StaticAsset(path, body, mimetype)
+
+        routes = {}
+        for path, asset in built.items():
+            routes[path] = (asset, REVALIDATE_CACHE_CONTROL)
+            if asset.mimetype not in HTML_TYPES:
+                routes[asset.fingerprinted_path] = (asset, IMMUTABLE_CACHE_CONTROL)
+        self.assets = built
+        self.routes = routes
+
+    def _rewrite_references(self, page_path, body, built):
+        base = os.path.dirname(page_path)
+
+        def replace(match):
+            prefix, slash, target, suffix = match.groups()
+            path = target if slash else os.path.normpath(os.path.join(base, target)).replace(os.sep, '/')
+            asset = built.get(path)
+            if asset is None:
+                return match.group(0)
+            fingerprinted = asset.fingerprinted_path if slash else \
+                os.path.relpath(asset.fingerprinted_path, base or '.').replace(os.sep, '/')
+            return f"{prefix}{slash}{fingerprinted}{suffix}"
+
+        text = body.decode('utf-8')
+        return ASSET_REFERENCE.sub(replace, text).encode('utf-8')
+
+    def _not_modified(self, asset, if_none_match):
+        # Weak comparison, as If-None-Match requires
+        tags = {tag.strip() for tag in if_none_match.split(',')}
+        tags |= {tag[2:] for tag in tags if tag.startswith('W/')}
+        return '*' in tags or bool(asset.etags() & tags)
+
+    def response(self, path, headers):
+        # Unknown paths get the index page so client-side routes keep working
+        route = self.routes.get(path) or self.routes.get(self.index)
+        if route is None:
+            return None
+        asset, cache_control = route
+
+        # Highest q wins; ties go to the better compressor, as for API responses
+        codings = parse_accept_encoding(headers.get('Accept-Encoding'))
+        encoding, best_q = None, 0.0
+        for candidate in ENCODING_PREFERENCE:
+            if candidate not in asset.variants:
+                continue
+            q = codings.get(candidate, codings.get('*', 0.0))
+            if q > best_q:
+                encoding, best_q = candidate, q
+        body, etag = asset.variants[encoding]
+
+        if self._not_modified(asset, headers.get('If-None-Match', '')):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=asset.mimetype)
+            if encoding is not None:
+                response.headers['Content-Encoding'] = encoding
+        response.headers['ETag'] = etag
+        response.headers['Cache-Control'] = cache_control
+        if len(asset.variants) > 1:
+            response.vary.add('Accept-Encoding')
+        return response
@@ -0,0 +1,69 @@
+import re
+from datetime import datetime
+
+# Section keywords in one lookahead pattern, so one pass finds every section
+# and stops as soon as all of them have been seen
+SECTION_PATTERN = re.compile(
+    r'(?=(?P<education>education)|(?P<experience>experience)|'
+    r'(?P<skills>skills)|(?P<contact>email|phone|address))',
+    re.IGNORECASE
+)
+YEARS_PATTERN = re.compile(r'(\d+)[\+]?\s*(?:years?|yrs?)', re.IGNORECASE)
+DATE_RANGE_PATTERN = re.compile(r'(\d{4})\s*-\s*(?:present|current|\d{4})', re.IGNORECASE)
+# Anything other than letters, digits and basic punctuation
+SPECIAL_CHAR_PATTERN = re.compile(r'[^\w .,()\-:;/]|_')
+
+SECTION_NAMES = ('contact', 'education', 'experience', 'skills')
+
+
+class TextProfile:
+    # Everything the parser and the ATS checks need to know about the raw
+    # text, computed once per text and shared so neither has to rescan it.
+    # That takes a handful of passes (the section, years, date range and
+    # special character patterns, a line split and two substring checks);
+    # each runs in C, which beats one combined pattern driven from Python.
+    def __init__(self, text=''):
+        self.sections = dict.fromkeys(SECTION_NAMES, False)
+        self.year_mentions = []
+        self.date_range_starts = []
+        self.longest_line = 0
+        self.has_tabs = False
+        self.has_double_spaces = False
+        self.special_char_count = 0
+        # Length of the last line of the text so far, which add() may extend
+        self._open_line = 0
+        self.add(text)
+
+    def add(self, text):
+        # Extends the profile by text appended to everything added before, so
+        # a PDF can be profiled page by page as it is extracted. Add the page
+        # breaks as their own '\n' calls: the only thing then missed is a year
+        # or date mention split across a break.
+        if not all(self.sections.values()):
+            for match in SECTION_PATTERN.finditer(text):
+                self.sections[match.lastgroup] = True
+                if all(self.sections.values()):
+                    break
+
+        self.year_mentions += [int(years) for years in YEARS_PATTERN.findall(text)]
+        self.date_range_starts += [int(year) for year in DATE_RANGE_PATTERN.findall(text)]
+        lines = text.split('\n')
+        self.longest_line = max(self.longest_line, self._open_line + len(lines[0]), *map(len, lines[1:]))
+        self._open_line = (self._open_line if len(lines) == 1 else 0) + len(lines[-1])
+        self.has_tabs = self.has_tabs or '\t' in text
+        self.has_double_spaces = self.has_double_spaces or '  ' in text
+        self.special_char_count += len(SPECIAL_CHAR_PATTERN.findall(text))
+
+    def years_of_experience(self):
+        current_year = datetime.now().year
+        years_found = self.year_mentions + [current_year - year for year in self.date_range_starts]
+        return max(years_found) if years_found else None
+
+    def to_dict(self):
+        return {name: value for name, value in vars(self).items() if not name.startswith('_')}
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls.__new__(cls)
+        profile.__dict__.update(data)
+        return profile
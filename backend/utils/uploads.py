@@ -0,0 +1,223 @@
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+
+# The PDF header may follow up to 1 KB of junk; every other signature is at
+# the very start of the file
+SNIFF_BYTES = 1024
+
+# Formats a file's content may have for each accepted extension. PIL reads
+# either image format whatever the file is called.
+EXTENSION_FORMATS = {
+    'pdf': {'pdf'},
+    'docx': {'zip'},
+    'zip': {'zip'},
+    'png': {'png', 'jpeg'},
+    'jpg': {'png', 'jpeg'},
+    'jpeg': {'png', 'jpeg'}
+}
+
+
+def sniff_format(head):
+    # Format of a file from its first bytes, or None when unrecognized
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if head.startswith(b'PK\x03\x04'):
+        return 'zip'
+    if b'%PDF-' in head[:SNIFF_BYTES]:
+        return 'pdf'
+    return None
+
+
+def file_extension(filename):
+    return os.path.splitext(filename or '')[1].lower().lstrip('.')
+
+
+def content_matches(filename, head):
+    # Unknown extensions are left to the caller's extension check
+    expected = EXTENSION_FORMATS.get(file_extension(filename))
+    return expected is None or sniff_format(head) in expected
+
+
+class UploadRejected(Exception):
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+class BufferedUpload:
+    def __init__(self, source, sha256, size):
+        # source is a memoryview for small uploads and a rewound temporary
+        # file for uploads above the spool threshold
+        self.source = source
+        self.sha256 = sha256
+        self.size = size
+
+    def read_bytes(self):
+        # A standalone copy, e.g. for handing the file to another process
+        if isinstance(self.source, memoryview):
+            return self.source.tobytes()
+        self.source.seek(0)
+        return self.source.read()
+
+    def close(self):
+        if hasattr(self.source, 'close'):
+            self.source.close()
+
+
+class UploadSpool:
+    # Write target for one uploaded file: checks its size and format and
+    # hashes it while it is received. It stays in memory unless it grows past
+    # spool_threshold, in which case it moves to a temp file. A file that
+    # fails a check is dropped and the rest of it discarded as it arrives;
+    # finish() then raises UploadRejected.
+    def __init__(self, filename, max_bytes=None, spool_threshold=5 * 1024 * 1024):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self.error = None
+        self.status = None
+        self._digest = hashlib.sha256()
+        self._head = b''
+        self._file = io.BytesIO()
+
+    def write(self, data):
+        if self.error is not None:
+            return len(data)
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            self._reject(f'File exceeds {self.max_bytes} bytes', 413)
+            return len(data)
+        if len(self._head) < SNIFF_BYTES:
+            self._head += bytes(data[:SNIFF_BYTES - len(self._head)])
+            if len(self._head) >= SNIFF_BYTES and not content_matches(self.filename, self._head):
+                self._reject('File content does not match its type', 415)
+                return len(data)
+
+        self._digest.update(data)
+        if isinstance(self._file, io.BytesIO) and self.size > self.spool_threshold:
+            spool = tempfile.TemporaryFile()
+            spool.write(self._file.getbuffer())
+            self._file = spool
+        return self._file.write(data)
+
+    def _reject(self, message, status):
+        self.error = message
+        self.status = status
+        self._file.close()
+        self._file = io.BytesIO()
+
+    def finish(self):
+        # The checked upload; short files are sniffed here
+        if self.error is None and not content_matches(self.filename, self._head):
+            self._reject('File content does not match its type', 415)
+        if self.error is not None:
+            raise UploadRejected(self.error, self.status)
+        if isinstance(self._file, io.BytesIO):
+            source = self._file.getbuffer()
+        else:
+            self._file.seek(0)
+            source = self._file
+        return BufferedUpload(source, self._digest.hexdigest(), self.size)
+
+    def __getattr__(self, name):
+        # Everything else (seek, read, close...) goes to the buffered file
+        return getattr(self._file, name)
+
+
+def buffer_upload(stream, spool_threshold, chunk_size=65536, filename=None, max_bytes=None):
+    # Reads an upload once through an UploadSpool
+    spool = UploadSpool(filename, max_bytes, spool_threshold)
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        spool.write(chunk)
+        if spool.error is not None:
+            break
+    return spool.finish()
+
+
+def receive_upload(file, spool_threshold, max_bytes=None):
+    # A request whose stream factory creates UploadSpools has already checked
+    # and hashed the file while parsing the form; otherwise read it now
+    if isinstance(file.stream, UploadSpool):
+        return file.stream.finish()
+    return buffer_upload(file.stream, spool_threshold, filename=file.filename, max_bytes=max_bytes)
+
+
+class BatchItem:
+    def __init__(self, filename, data=None, error=None, sha256=None):
+        self.filename = filename
+        self.data = data
+        self.error = error
+        if sha256 is None and data is not None:
+            sha256 = hashlib.sha256(data).hexdigest()
+        self.sha256 = sha256
+
+
+def read_batch_uploads(files, allowed_extensions, max_files, max_file_bytes, max_total_bytes=None):
+    # Expands a multipart list of resumes and/or zip archives into one item
+    # per resume. Files that cannot be used get an error instead of data so
+    # they are reported without failing the rest of the batch. Every resume
+    # is held in memory until it is parsed, so max_total_bytes caps their
+    # combined (for archive members, uncompressed) size before any is read.
+    items = []
+    total = [0]
+
+    def add(filename, size, read, sha256=None, error=None):
+        if len(items) >= max_files:
+            raise ValueError(f"A batch may contain at most {max_files} resumes")
+        if file_extension(filename) not in allowed_extensions:
+            items.append(BatchItem(filename, error='Invalid file type'))
+        elif error is not None:
+            items.append(BatchItem(filename, error=error))
+        elif size > max_file_bytes:
+            items.append(BatchItem(filename, error=f'File exceeds {max_file_bytes} bytes'))
+        else:
+            total[0] += size
+            if max_total_bytes is not None and total[0] > max_total_bytes:
+                raise ValueError(f"A batch may contain at most {max_total_bytes} bytes of resumes")
+            # An archive member never decompresses to more than its
+            # recorded size, so the checks above bound what this reads
+            data = read()
+            if content_matches(filename, data[:SNIFF_BYTES]):
+                items.append(BatchItem(filename, data=data, sha256=sha256))
+            else:
+                items.append(BatchItem(filename, error='File content does not match its type'))
+
+    for file in files:
+        if not file or file.filename == '':
+            continue
+
+        if isinstance(file.stream, UploadSpool):
+            # Checked and hashed while the request was received
+            try:
+                upload = file.stream.finish()
+            except UploadRejected as e:
+                if file_extension(file.filename) == 'zip':
+                    raise
+                add(file.filename, file.stream.size, None, error=str(e))
+                continue
+            if file_extension(file.filename) != 'zip':
+                add(file.filename, upload.size, upload.read_bytes, sha256=upload.sha256)
+                continue
+
+        if file.filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(file.stream) as archive:
+                for info in archive.infolist():
+                    name = os.path.basename(info.filename)
+                    # Skip directories and macOS resource forks
+                    if info.is_dir() or not name or info.filename.startswith('__MACOSX/'):
+                        continue
+                    add(info.filename, info.file_size,
+                        lambda info=info, archive=archive: archive.read(info))
+        else:
+            file.stream.seek(0, os.SEEK_END)
+            size = file.stream.tell()
+            file.stream.seek(0)
+            add(file.filename, size, file.stream.read)
+
+    return items
@@ -0,0 +1,173 @@
+import io
+import random
+import zipfile
+
+import docx
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+# Deterministic synthetic resumes. Every document is derived from a seeded
+# random.Random, so a given (seed, counts) pair always yields the same text.
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Sam', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Kowalski', 'Okafor', 'Nguyen', 'Silva', 'Novak', 'Haddad']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Hooli', 'Vandelay Imports',
+             'Wayne Enterprises', 'Soylent Systems', 'Cyberdyne']
+TITLES = ['Software Engineer', 'Data Scientist', 'Web Developer', 'DevOps Engineer', 'Data Engineer',
+          'Machine Learning Engineer', 'QA Engineer', 'Cloud Architect', 'Security Engineer', 'Mobile Developer']
+SKILLS = ['python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'sql', 'postgresql', 'mongodb',
+          'redis', 'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring', 'aws', 'azure', 'gcp',
+          'docker', 'kubernetes', 'terraform', 'jenkins', 'git', 'linux', 'tensorflow', 'pytorch', 'pandas',
+          'numpy', 'scikit-learn', 'machine learning', 'deep learning', 'data analysis', 'etl', 'spark',
+          'hadoop', 'airflow', 'kafka', 'selenium', 'jira', 'agile', 'scrum', 'rest api', 'graphql',
+          'microservices', 'ci/cd', 'html', 'css', 'figma', 'android', 'ios', 'swift', 'kotlin']
+VERBS = ['Built', 'Designed', 'Led', 'Migrated', 'Automated', 'Optimized', 'Maintained', 'Launched', 'Refactored',
+         'Scaled']
+OBJECTS = ['a payments platform', 'the data pipeline', 'customer facing dashboards', 'an internal API gateway',
+           'the recommendation service', 'deployment tooling', 'the reporting warehouse', 'a mobile checkout flow',
+           'the search backend', 'monitoring and alerting']
+OUTCOMES = ['reducing latency by {n}%', 'serving {n}k daily users', 'cutting costs by {n}%',
+            'improving test coverage to {n}%', 'shortening release cycles by {n}%']
+DEGREES = ['B.Sc. Computer Science', 'M.Sc. Data Science', 'B.Eng. Software Engineering', 'B.A. Mathematics']
+UNIVERSITIES = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University']
+
+KINDS = ('pdf', 'docx', 'png', 'long_pdf')
+# Timestamp of every entry in the generated DOCX files
+DOCX_DATE_TIME = (2024, 1, 1, 0, 0, 0)
+EXTENSIONS = {'pdf': 'pdf', 'docx': 'docx', 'png': 'png', 'long_pdf': 'pdf'}
+
+
+def resume_lines(rng, jobs=3, bullets=4):
+    # Plain text lines of one resume; more jobs and bullets make longer ones
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(8, 16))
+    lines = [
+        name,
+        title,
+        f"Email: {name.lower().replace(' ', '.')}@example.com | Phone: +1 555 {rng.randint(100, 999)} "
+        f"{rng.randint(1000, 9999)} | Address: {rng.randint(1, 99)} Main Street",
+        '',
+        'SUMMARY',
+        f"{title} with {rng.randint(2, 15)}+ years of experience in {', '.join(skills[:3])} and {skills[3]}.",
+        '',
+        'EXPERIENCE',
+    ]
+    year = 2024
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({start} - {year if year < 2024 else 'Present'})")
+        for _ in range(bullets):
+            outcome = rng.choice(OUTCOMES).format(n=rng.randint(10, 90))
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} and "
+                         f"{rng.choice(skills)}, {outcome}")
+        year = start
+    lines += [
+        '',
+        'EDUCATION',
+        f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)} ({year - 4} - {year})",
+        '',
+        'SKILLS',
+        ', '.join(skills),
+    ]
+    return lines
+
+
+def _pdf_escape(line):
+    line = line.encode('latin-1', 'replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(lines, lines_per_page=50):
+    # A minimal hand-written PDF (Helvetica text, no compression) so the
+    # corpus needs no PDF writer library; output is byte-for-byte reproducible
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = {1: b'<< /Type /Catalog /Pages 2 0 R >>',
+               3: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'}
+    kids = []
+    for index, page_lines in enumerate(pages):
+        page_id = 4 + index * 2
+        content_id = page_id + 1
+        stream = 'BT /F1 10 Tf 14 TL 50 800 Td\n' + ''.join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + 'ET'
+        stream = stream.encode('latin-1')
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        objects[content_id] = b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream'
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = out.tell()
+        out.write(b'%d 0 obj\n' % number + objects[number] + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for number in sorted(objects):
+        out.write(b'%010d 00000 n \n' % offsets[number])
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(lines):
+    document = docx.Document()
+    for line in lines:
+        if line.isupper():
+            document.add_heading(line.title(), level=2)
+        else:
+            document.add_paragraph(line)
+    saved = io.BytesIO()
+    document.save(saved)
+    # python-docx stamps every zip entry with the current time; rewrite the
+    # archive with a fixed one so the bytes only depend on the lines
+    out = io.BytesIO()
+    with zipfile.ZipFile(saved) as source, zipfile.ZipFile(out, 'w') as target:
+        for info in source.infolist():
+            entry = zipfile.ZipInfo(info.filename, date_time=DOCX_DATE_TIME)
+            entry.compress_type = info.compress_type
+            entry.external_attr = info.external_attr
+            target.writestr(entry, source.read(info))
+    return out.getvalue()
+
+
+def _font(size):
+    try:
+        return ImageFont.truetype('DejaVuSans.ttf', size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def make_png(lines, rng, width=1700, line_height=34):
+    # A letter-size page at 200 DPI with light noise and blur, like a scan
+    height = max(2200, 80 + line_height * len(lines))
+    image = Image.new('L', (width, height), 245)
+    draw = ImageDraw.Draw(image)
+    font = _font(24)
+    for row, line in enumerate(lines):
+        draw.text((90, 60 + row * line_height), line, fill=20, font=font)
+    for _ in range(width * height // 400):
+        draw.point((rng.randrange(width), rng.randrange(height)), fill=rng.randint(120, 200))
+    image = image.filter(ImageFilter.GaussianBlur(0.6))
+    out = io.BytesIO()
+    image.save(out, format='PNG', dpi=(200, 200))
+    return out.getvalue()
+
+
+def build_corpus(seed=1234, counts=None):
+    # Returns [(kind, filename, bytes)] for the requested number of each kind
+    counts = counts or {'pdf': 20, 'docx': 20, 'png': 5, 'long_pdf': 5}
+    rng = random.Random(seed)
+    corpus = []
+    for kind in KINDS:
+        for index in range(counts.get(kind, 0)):
+            if kind == 'long_pdf':
+                data = make_pdf(resume_lines(rng, jobs=12, bullets=45))
+            elif kind == 'pdf':
+                data = make_pdf(resume_lines(rng))
+            elif kind == 'docx':
+                data = make_docx(resume_lines(rng))
+            else:
+                data = make_png(resume_lines(rng, jobs=2, bullets=3), rng)
+            corpus.append((kind, f"{kind}_{index:04d}.{EXTENSIONS[kind]}", data))
+    return corpus
@@ -0,0 +1,67 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Format and NLP libraries that must only be imported when a request needs them
+LAZY_MODULES = ('docx', 'pdfminer', 'pytesseract', 'PIL', 'fitz', 'pymupdf', 'scipy', 'spacy')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(module, env):
+    # One fresh interpreter importing module under -X importtime; returns
+    # {imported module: cumulative microseconds}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Fail when importing the app gets slower than a budget or loads lazy dependencies')
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--runs', type=int, default=5, help='interpreters started; the median is used')
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('IMPORT_BUDGET_MS', 800)))
+    parser.add_argument('--top', type=int, default=15, help='slowest imports to list')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='import-budget-')
+    env = dict(os.environ, CANDIDATE_INDEX_PATH=os.path.join(workdir, 'candidates.sqlite3'))
+    runs = [measure(args.module, env) for _ in range(args.runs)]
+
+    total_ms = statistics.median(run[args.module] for run in runs) / 1000
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)[:args.top]
+    print(f"import {args.module}: {total_ms:.0f}ms (median of {args.runs}, budget {args.budget_ms:.0f}ms)")
+    for name, microseconds in slowest:
+        print(f"  {microseconds / 1000:>8.1f}ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import {args.module} took {total_ms:.0f}ms, over the {args.budget_ms:.0f}ms budget")
+    eager = sorted({name.split('.')[0] for name in runs[-1]} & set(LAZY_MODULES))
+    if eager:
+        failures.append(f"import {args.module} loads modules that should be imported lazily: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
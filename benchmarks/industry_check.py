@@ -0,0 +1,49 @@
+import argparse
+import random
+import sys
+from collections import Counter
+
+from backend.models.industry_analyzer import IndustryAnalyzer
+
+from .corpus import resume_lines
+from .sample_resumes import SAMPLE_RESUMES
+
+# Every synthetic resume describes a software or data role
+EXPECTED_INDUSTRY = 'Technology'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Fail when industry detection mislabels the synthetic (all technology) resumes '
+                    'or any of the hand written sample resumes')
+    parser.add_argument('--count', type=int, default=300, help='resumes generated')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--min-share', type=float, default=1.0,
+                        help=f'share of resumes that must be detected as {EXPECTED_INDUSTRY}')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    analyzer = IndustryAnalyzer()
+    detected = Counter()
+    for _ in range(args.count):
+        detected[analyzer.detect_industry('\n'.join(resume_lines(rng)))] += 1
+
+    share = detected[EXPECTED_INDUSTRY] / args.count if args.count else 1.0
+    print(f"{args.count} resumes: " + ', '.join(f"{industry} {n}" for industry, n in detected.most_common()))
+    failed = False
+    if share < args.min_share:
+        print(f"FAIL: {share:.1%} detected as {EXPECTED_INDUSTRY}, below {args.min_share:.1%}")
+        failed = True
+
+    mislabeled = 0
+    for expected, text in SAMPLE_RESUMES:
+        industry = analyzer.detect_industry(text)
+        if industry != expected:
+            print(f"FAIL: {expected} sample resume ({text.splitlines()[1]}) detected as {industry}")
+            mislabeled += 1
+    print(f"{len(SAMPLE_RESUMES)} sample resumes: {len(SAMPLE_RESUMES) - mislabeled} detected correctly")
+    return 1 if failed or mislabeled else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
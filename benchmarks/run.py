@@ -0,0 +1,272 @@
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from .corpus import KINDS, build_corpus
+
+ROLE = 'software_engineer'
+
+# Latency metrics compared against a baseline
+COMPARED_METRICS = ('p50_ms', 'p95_ms')
+
+
+def percentile(values, pct):
+    # Linear interpolation between closest ranks
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples_ms):
+    total_s = sum(samples_ms) / 1000
+    return {
+        'count': len(samples_ms),
+        'mean_ms': round(sum(samples_ms) / len(samples_ms), 3),
+        'p50_ms': round(percentile(samples_ms, 50), 3),
+        'p95_ms': round(percentile(samples_ms, 95), 3),
+        'p99_ms': round(percentile(samples_ms, 99), 3),
+        'max_ms': round(max(samples_ms), 3),
+        # Serial throughput: documents per second of time spent in the stage
+        'throughput_per_s': round(len(samples_ms) / total_s, 2) if total_s else None
+    }
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+
+    def time(self, names, fn):
+        # Runs fn, recording its wall time under every name in names
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self.errors[names[0]] += 1
+            print(f"{names[0]} failed: {str(e)}")
+            raise
+        elapsed = (time.perf_counter() - start) * 1000
+        for name in names:
+            self.samples[name].append(elapsed)
+        return result
+
+    def results(self):
+        return {name: summarize(samples) for name, samples in sorted(self.samples.items())}
+
+
+def bench_stages(app_module, corpus, iterations, recorder):
+    # Each analyzer stage on its own, called the way a request calls it but
+    # without a shared AnalysisContext
+    from backend.parsers.resume_parser import ResumeParser
+
+    keyword_extractor = app_module.analyzers.get('keyword_extractor')
+    job_role_analyzer = app_module.analyzers.get('job_role_analyzer')
+    ats_analyzer = app_module.analyzers.get('ats_analyzer')
+    industry_analyzer = app_module.analyzers.get('industry_analyzer')
+    role_requirements = {'keywords': app_module.JOB_REQUIREMENTS[ROLE], 'required_years': 2, 'weight': 1.0}
+
+    for _ in range(iterations):
+        for kind, filename, data in corpus:
+            parser = ResumeParser()
+            try:
+                text = recorder.time(['parser.extract_text', f'parser.extract_text[{kind}]'],
+                                     lambda: parser.extract_text(data, filename=filename))
+                sections = recorder.time(['parser.extract_sections'], parser.extract_sections)
+                keywords = recorder.time(['keyword_extractor.extract_keywords'],
+                                         lambda: keyword_extractor.extract_keywords(text))
+                recorder.time(['job_role_analyzer.analyze_job_roles'],
+                              lambda: job_role_analyzer.analyze_job_roles(text, keywords))
+                recorder.time(['job_role_analyzer.analyze_specific_role'],
+                              lambda: job_role_analyzer.analyze_specific_role(text, keywords, ROLE))
+                recorder.time(['ats_analyzer.calculate_ats_score'],
+                              lambda: ats_analyzer.calculate_ats_score(text, role_requirements, sections, keywords))
+                recorder.time(['industry_analyzer.analyze_industry_fit'],
+                              lambda: industry_analyzer.analyze_industry_fit(text, keywords))
+            except Exception:
+                continue
+
+
+def bench_end_to_end(app_module, corpus, iterations, recorder):
+    # POST /analyze through the Flask test client, first with empty caches
+    # and then again for the same file (served from the result cache)
+    client = app_module.app.test_client()
+
+    def post(filename, data):
+        response = client.post('/analyze', data={
+            'resume': (io.BytesIO(data), filename), 'job_role': ROLE
+        }, content_type='multipart/form-data')
+        if response.status_code != 200:
+            raise Exception(f"{filename}: HTTP {response.status_code}")
+
+    for _ in range(iterations):
+        for kind, filename, data in corpus:
+            app_module.text_cache.clear()
+            app_module.result_cache.clear()
+            try:
+                recorder.time(['analyze.cold', f'analyze.cold[{kind}]'], lambda: post(filename, data))
+                recorder.time(['analyze.cached'], lambda: post(filename, data))
+            except Exception:
+                continue
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    # Returns (rows, regressions) for every metric present in both runs
+    rows = []
+    regressions = []
+    for section in ('stages', 'end_to_end'):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if previous is None:
+                continue
+            for metric in COMPARED_METRICS:
+                before, after = previous.get(metric), current.get(metric)
+                if not before or after is None:
+                    continue
+                change = after / before - 1
+                row = (f"{section}.{name}", metric, before, after, change)
+                rows.append(row)
+                if change > threshold and after - before > min_delta_ms:
+                    regressions.append(row)
+    return rows, regressions
+
+
+def print_summary(results):
+    for section in ('stages', 'end_to_end'):
+        print(f"\n{section}")
+        print(f"  {'name':48} {'n':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'docs/s':>10}")
+        for name, stats in results[section].items():
+            print(f"  {name:48} {stats['count']:>5} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+                  f"{stats['p99_ms']:>10.2f} {stats['throughput_per_s'] or 0:>10.1f}")
+    print(f"\npeak RSS {results['peak_rss_mb']} MB")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Benchmark resume parsing and analysis on a synthetic corpus')
+    parser.add_argument('--seed', type=int, default=1234)
+    for kind, default in (('pdf', 20), ('docx', 20), ('png', 5), ('long_pdf', 5)):
+        parser.add_argument(f"--{kind.replace('_', '-')}", type=int, default=default, dest=kind,
+                            help=f"number of {kind} documents (default {default})")
+    parser.add_argument('--iterations', type=int, default=3, help='timed passes over the corpus')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed passes before measuring')
+    parser.add_argument('--skip-stages', action='store_true')
+    parser.add_argument('--skip-end-to-end', action='store_true')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--save-baseline', help='also write the results to this file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression (default 0.2)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help='ignore slowdowns smaller than this many ms')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    counts = {kind: getattr(args, kind) for kind in KINDS}
+    if counts['png'] and shutil.which('tesseract') is None:
+        print("tesseract not found; skipping png documents")
+        counts['png'] = 0
+
+    # Keep the benchmark from writing into the real candidate index and
+    # from reading a persistent cache
+    workdir = tempfile.mkdtemp(prefix='resume-bench-')
+    os.environ['CANDIDATE_INDEX_PATH'] = os.path.join(workdir, 'candidates.sqlite3')
+    os.environ.pop('RESUME_CACHE_PATH', None)
+
+    start = time.perf_counter()
+    corpus = build_corpus(args.seed, counts)
+    corpus_seconds = time.perf_counter() - start
+    print(f"Built {len(corpus)} documents in {corpus_seconds:.1f}s "
+          f"({', '.join(f'{kind}={count}' for kind, count in counts.items())})")
+
+    import app as app_module
+
+    warmup = Recorder()
+    if args.warmup:
+        if not args.skip_stages:
+            bench_stages(app_module, corpus, args.warmup, warmup)
+        if not args.skip_end_to_end:
+            bench_end_to_end(app_module, corpus, args.warmup, warmup)
+
+    stages = Recorder()
+    end_to_end = Recorder()
+    if not args.skip_stages:
+        bench_stages(app_module, corpus, args.iterations, stages)
+    if not args.skip_end_to_end:
+        bench_end_to_end(app_module, corpus, args.iterations, end_to_end)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+            'documents': counts,
+            'iterations': args.iterations,
+            'warmup': args.warmup
+        },
+        'stages': stages.results(),
+        'end_to_end': end_to_end.results(),
+        'errors': dict(stages.errors + end_to_end.errors),
+        'peak_rss_mb': peak_rss_mb()
+    }
+    print_summary(results)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {path}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows, regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        print(f"\nCompared with {args.baseline} ({baseline.get('meta', {}).get('git_revision')})")
+        baseline_meta = baseline.get('meta', {})
+        if (baseline_meta.get('seed'), baseline_meta.get('documents')) != (args.seed, counts):
+            print("  Warning: the baseline was measured on a different corpus")
+        for name, metric, before, after, change in rows:
+            flag = '  REGRESSION' if (name, metric, before, after, change) in regressions else ''
+            print(f"  {name:58} {metric:7} {before:>10.2f} -> {after:>10.2f} ({change:+.0%}){flag}")
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# Hand written resumes from several industries with the industry each one
+# should be detected as. They read like real resumes: "it" is used as a
+# pronoun and headings such as Education appear whatever the industry.
+
+SAMPLE_RESUMES = [
+    ('Technology', """Priya Shah
+Software Engineer
+
+Experience
+Senior Software Engineer, Cloudworks (2019 - Present)
+- Develop backend services in Go and Python; migrated billing to Kubernetes
+- Led development of an internal deployment tool and made it the team default
+Software Developer, WebShop (2016 - 2019)
+- Built React front ends and REST APIs; improved page load times by 40%
+
+Education
+B.S. Computer Science, Institute of Technology
+
+Skills
+Python, Go, Java, Kubernetes, AWS, PostgreSQL, CI/CD, agile programming practices
+"""),
+    ('Technology', """Kevin Brooks
+IT Support Specialist
+
+Experience
+IT Support Specialist, Lakeside Insurance (2018 - Present)
+- Resolve 40 tickets a week for hardware, software and network issues
+- Image and deploy laptops; keep the asset inventory current
+Help Desk Technician, Metro Library (2015 - 2018)
+- Reset accounts, installed printers and documented fixes in the knowledge base
+
+Certifications
+CompTIA A+, Network+
+
+Skills
+Active Directory, Windows, Office 365, ticketing systems, troubleshooting
+"""),
+    ('Finance', """Daniel Kim
+Financial Analyst
+
+Experience
+Senior Financial Analyst, First National Bank (2019 - Present)
+- Build monthly forecasts and variance reports for the retail banking division
+- Automated the budgeting workbook so it refreshes from the general ledger overnight
+- Evaluated investment proposals and presented financial models to the CFO
+Analyst, Harbor Capital (2016 - 2019)
+- Supported the trading desk with daily risk and P&L reporting
+- Reconciled accounts and prepared it for quarterly audit
+
+Education
+B.B.A. Finance, City College
+
+Skills
+Excel, financial modeling, valuation, SQL, risk management, Bloomberg
+"""),
+    ('Healthcare', """Maria Lopez, RN
+Registered Nurse
+
+Summary
+Compassionate nurse with 8 years of experience in acute care. I keep patient records accurate and make sure it is easy for the next shift to pick up care.
+
+Experience
+Charge Nurse, St. Mary's Hospital (2018 - Present)
+- Coordinate care for a 30 bed medical surgical unit and mentor new graduate nurses
+- Led the rollout of the new electronic health record; trained staff to use it at the bedside
+- Reduced patient falls by 20% through hourly rounding
+Staff Nurse, County Clinic (2015 - 2018)
+- Administered medications and monitored patient vitals in a busy outpatient clinic
+- Supported clinical trials by collecting samples and documenting results
+
+Education
+B.S. Nursing, State University
+
+Skills
+Patient assessment, IV therapy, wound care, clinical documentation, BLS, ACLS
+"""),
+    ('Healthcare', """Angela Price
+Medical Receptionist
+
+Experience
+Front Desk Coordinator, Family Medical Group (2017 - Present)
+- Schedule appointments for six physicians and check in 80 patients a day
+- Verify insurance and make sure it is on file before each visit
+- Answer phones, route it to the right nurse, and keep the waiting room running smoothly
+Receptionist, Dental Partners (2014 - 2017)
+- Managed the appointment book and followed up on it daily
+
+Skills
+Scheduling, insurance verification, EHR software, customer service
+"""),
+    ('Education', """Emily Carter
+High School Mathematics Teacher
+
+Experience
+Mathematics Teacher, Lincoln High School (2014 - Present)
+- Teaching algebra and calculus to 150 students a year; pass rates rose 15%
+- Designed an after school tutoring program and ran it for four years
+- Lead academic advisor for the senior class
+Student Teacher, Roosevelt Middle School (2013 - 2014)
+- Planned lessons, graded assignments and met with parents
+
+Education
+M.Ed. Curriculum and Instruction, State University
+B.S. Mathematics, State University
+
+Certifications
+State teaching license, grades 7-12
+"""),
+    ('Retail', """Jason Reed
+Store Manager
+
+Experience
+Store Manager, Fashion Outlet (2017 - Present)
+- Manage a team of 25 associates and a store with $4M annual sales
+- Improved customer service scores by reorganizing the floor so it is easier to navigate
+- Own merchandising, inventory and visual displays
+Assistant Manager, Corner Market (2013 - 2017)
+- Scheduled staff, handled returns and trained new cashiers
+- Grew retail sales 12% with seasonal promotions
+
+Skills
+Sales, merchandising, inventory control, scheduling, point of sale systems
+"""),
+    ('Manufacturing', """Robert Nowak
+Production Supervisor
+
+Experience
+Production Supervisor, Midwest Auto Parts (2016 - Present)
+- Supervise three assembly lines and 60 operators across two shifts
+- Cut scrap 18% with a lean manufacturing program; it now runs in every plant
+- Coordinate preventive maintenance on industrial equipment
+Line Lead, Precision Components (2011 - 2016)
+- Ran production scheduling and quality checks on the assembly floor
+
+Education
+A.A.S. Industrial Technology, Community College
+
+Skills
+Lean manufacturing, Six Sigma Green Belt, OSHA safety, production planning
+"""),
+]
@@ -8,7 +8,4 @@ pip install --upgrade pip
 pip install wheel setuptools
 pip install -r requirements.txt
 
-# Download spaCy model
-python -m spacy download en_core_web_sm
-
 echo "Build completed successfully!" 
\ No newline at end of file
@@ -0,0 +1,3 @@
+# Import the app (and build the analyzer registry) once in the master process;
+# workers are forked afterwards and share the loaded models copy-on-write.
+preload_app = True
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from backend.utils.job_queue import JobQueue
+from backend.utils.result_cache import SqliteCache
+
+
+def wait_finished(queue, job, timeout=5):
+    end = time.monotonic() + timeout
+    while job.finished_at is None and time.monotonic() < end:
+        time.sleep(0.01)
+    return queue.get(job.id)
+
+
+def raise_builtin_timeout(deadline):
+    # What parse_resume raises when its deadline passed before it started
+    raise TimeoutError('did not start before its deadline')
+
+
+def raise_future_timeout(deadline):
+    # What Future.result(timeout=...) raises
+    raise FutureTimeoutError()
+
+
+def succeed(value, deadline):
+    return {'value': value}
+
+
+class JobQueueTimeoutTest(unittest.TestCase):
+    # On Python 3.10 the two TimeoutError classes differ; both mean timeout
+    def test_builtin_timeout_error_marks_job_timed_out(self):
+        queue = JobQueue(max_workers=1)
+        job = wait_finished(queue, queue.submit(raise_builtin_timeout))
+        self.assertEqual(job.status, 'timeout')
+
+    def test_futures_timeout_error_marks_job_timed_out(self):
+        queue = JobQueue(max_workers=1)
+        job = wait_finished(queue, queue.submit(raise_future_timeout))
+        self.assertEqual(job.status, 'timeout')
+
+    def test_other_errors_mark_job_failed(self):
+        queue = JobQueue(max_workers=1)
+        job = wait_finished(queue, queue.submit(succeed))
+        self.assertEqual(job.status, 'failed')
+
+
+class JobQueueStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'jobs.sqlite3')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_job_is_visible_to_another_queue_sharing_the_store(self):
+        # Two queues stand in for two gunicorn workers
+        accepting = JobQueue(max_workers=1, store=SqliteCache(self.path, 'jobs'))
+        polled = JobQueue(max_workers=1, store=SqliteCache(self.path, 'jobs'))
+        job = wait_finished(accepting, accepting.submit(succeed, 42, meta={'filename': 'a.pdf'}))
+
+        seen = polled.get(job.id)
+        self.assertIsNotNone(seen)
+        self.assertEqual(seen.to_dict(), job.to_dict())
+        self.assertEqual(seen.to_dict()['result'], {'value': 42})
+
+    def test_unknown_job_is_not_found(self):
+        queue = JobQueue(max_workers=1, store=SqliteCache(self.path, 'jobs'))
+        self.assertIsNone(queue.get('missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()